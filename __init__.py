@@ -1,2 +1,7 @@
 # -*- coding: utf-8 -*-
-from . import models
\ No newline at end of file
+from . import controllers
+from . import models
+from . import populate
+from . import wizard
+
+from .hooks import post_init_hook
\ No newline at end of file
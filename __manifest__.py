@@ -28,14 +28,26 @@
         
         'views/scope_work_views.xml',
         'views/project_csl_views.xml',
+        'views/project_csl_lazy_views.xml',
+        'views/project_csl_budget_views.xml',
+        'views/project_csl_financial_summary_views.xml',
+        'views/project_csl_allocation_views.xml',
+        'views/project_csl_job_views.xml',
+        'views/project_csl_perf_log_views.xml',
+        'views/project_csl_move_backfill_views.xml',
         'views/project_csl_menus.xml',
         'views/res_users_views.xml', 
         'views/project_ref_sales.xml', 
         'views/account_move_views.xml',
         'views/purchase_order_views.xml',
 
+        'wizard/project_csl_attach_wizard_views.xml',
+        'wizard/res_users_csl_role_wizard_views.xml',
+
         'data/project_sequence.xml',
+        'data/ir_cron.xml',
     ],
+    'post_init_hook': 'post_init_hook',
     'installable': True,
     'application': True,
     'auto_install': False,
@@ -0,0 +1,147 @@
+# -*- coding: utf-8 -*-
+import csv
+import hashlib
+import io
+import json
+import tempfile
+import time
+
+import xlsxwriter
+
+from odoo import fields, http
+from odoo.http import request, content_disposition
+from odoo.tools import date_utils
+from odoo.tools.lru import LRU
+
+# Per worker cache of KPI payloads: key -> (expiry, etag, body)
+_kpi_cache = LRU(64)
+KPI_CACHE_TTL = 30
+
+class ProjectLedgerController(http.Controller):
+
+    _chunk_size = 2000
+
+    @http.route('/project_csl/ledger/export', type='http', auth='user')
+    def export_ledger(self, project_ids=None, file_format='csv', **kwargs):
+        """Stream the ledger of the given projects (all accessible projects by default)."""
+        Project = request.env['project.csl']
+        if project_ids:
+            projects = Project.browse([int(project_id) for project_id in project_ids.split(',')])
+            projects.check_access_rights('read')
+            projects.check_access_rule('read')
+        else:
+            projects = Project.search([])
+        for model_name in ('sale.order', 'purchase.order', 'account.move'):
+            request.env[model_name].check_access_rights('read')
+
+        query, params = Project._get_ledger_query(projects.ids, request.env.companies.ids)
+        header = Project._get_ledger_header()
+        chunks = self._iter_ledger_chunks(request.env.registry, query, params)
+
+        if file_format == 'xlsx':
+            return self._xlsx_response(header, chunks)
+        return self._csv_response(header, chunks)
+
+    def _iter_ledger_chunks(self, registry, query, params):
+        """Yield lists of rows fetched from a named (server-side) cursor.
+
+        The rows are read with a cursor of their own, so the generator keeps
+        working after the request cursor is closed while the response streams.
+        """
+        with registry.cursor() as cr:
+            with cr._cnx.cursor('project_csl_ledger_export') as server_cursor:
+                server_cursor.itersize = self._chunk_size
+                server_cursor.execute(query, params)
+                while True:
+                    rows = server_cursor.fetchmany(self._chunk_size)
+                    if not rows:
+                        break
+                    yield rows
+
+    def _csv_response(self, header, chunks):
+        def generate():
+            buffer = io.StringIO()
+            writer = csv.writer(buffer)
+            writer.writerow(header)
+            for rows in chunks:
+                writer.writerows(rows)
+                yield buffer.getvalue().encode('utf-8')
+                buffer.seek(0)
+                buffer.truncate()
+            if buffer.tell():
+                yield buffer.getvalue().encode('utf-8')
+
+        response = request.make_response(generate(), headers=[
+            ('Content-Type', 'text/csv; charset=utf-8'),
+            ('Content-Disposition', content_disposition('project_ledger.csv')),
+        ])
+        response.direct_passthrough = True
+        return response
+
+    def _xlsx_response(self, header, chunks):
+        # constant_memory flushes every row to disk once the next row starts
+        output = tempfile.TemporaryFile()
+        workbook = xlsxwriter.Workbook(output, {
+            'constant_memory': True,
+            'default_date_format': 'yyyy-mm-dd',
+        })
+        worksheet = workbook.add_worksheet('Ledger')
+        worksheet.write_row(0, 0, header, workbook.add_format({'bold': True}))
+        row_index = 1
+        for rows in chunks:
+            for row in rows:
+                worksheet.write_row(row_index, 0, row)
+                row_index += 1
+        workbook.close()
+        output.seek(0)
+
+        def generate():
+            with output:
+                while True:
+                    data = output.read(64 * 1024)
+                    if not data:
+                        break
+                    yield data
+
+        response = request.make_response(generate(), headers=[
+            ('Content-Type', 'application/vnd.openxmlformats-officedocument.spreadsheetml.sheet'),
+            ('Content-Disposition', content_disposition('project_ledger.xlsx')),
+        ])
+        response.direct_passthrough = True
+        return response
+
+
+class ProjectKpiController(http.Controller):
+
+    @http.route('/project_csl/kpi', type='http', auth='user', methods=['GET'])
+    def project_kpi(self, **kwargs):
+        """Project KPIs as JSON, cached per company set, amount access and KPI version.
+
+        Answers 304 Not Modified when the client's If-None-Match matches the
+        cached payload, which costs a single sequence read.
+        """
+        Project = request.env['project.csl']
+        Project.check_access_rights('read')
+        company_ids = tuple(sorted(request.env.companies.ids))
+        key = (
+            request.env.cr.dbname,
+            company_ids,
+            Project._can_read_kpi_amounts(),
+            Project._get_kpi_version(),
+            fields.Date.context_today(Project),
+        )
+
+        cached = _kpi_cache.get(key)
+        if not cached or cached[0] < time.monotonic():
+            body = json.dumps(
+                {'projects': Project._get_kpi_data(company_ids)},
+                default=date_utils.json_default,
+            ).encode('utf-8')
+            cached = (time.monotonic() + KPI_CACHE_TTL, hashlib.sha1(body).hexdigest(), body)
+            _kpi_cache[key] = cached
+        _expiry, etag, body = cached
+
+        headers = [('ETag', f'"{etag}"'), ('Cache-Control', 'private, no-cache')]
+        if request.httprequest.if_none_match.contains(etag):
+            return request.make_response(b'', headers=headers, status=304)
+        return request.make_response(body, headers=headers + [('Content-Type', 'application/json')])
@@ -0,0 +1,19 @@
+# -*- coding: utf-8 -*-
+import logging
+
+import psycopg2
+
+_logger = logging.getLogger(__name__)
+
+
+def post_init_hook(env):
+    """Enable pg_trgm when the database user may, then build the search indexes."""
+    if not env.registry.has_trigram:
+        try:
+            with env.cr.savepoint():
+                env.cr.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+        except psycopg2.Error:
+            _logger.warning("Could not install pg_trgm, project text search will scan the tables")
+            return
+        env.registry.has_trigram = True
+    env['project.csl']._create_search_indexes()
@@ -2,8 +2,15 @@
 from . import scope_work
 from . import project_lines
 from . import account_move
+from . import account_move_backfill
 from . import purchase_order
 from . import project_csl
+from . import project_csl_budget
+from . import project_csl_allocation
+from . import project_csl_financial_summary
+from . import project_csl_job
+from . import project_csl_perf_log
 from . import res_users
+from . import res_groups
 from . import repair_order
 # from . import employee_requisition
\ No newline at end of file
@@ -1,5 +1,14 @@
 # -*- coding: utf-8 -*-
-from odoo import models, fields, api
+from odoo import models, fields, api, tools
+from .project_csl_perf_log import instrumented
+
+# Source document model for each move type that can inherit a project
+ORIGIN_MODEL_BY_MOVE_TYPE = {
+    'out_invoice': 'sale.order',
+    'out_refund': 'sale.order',
+    'in_invoice': 'purchase.order',
+    'in_refund': 'purchase.order',
+}
 
 class AccountMove(models.Model):
     _inherit = 'account.move'
@@ -10,80 +19,169 @@ class AccountMove(models.Model):
         help="Linked Project",
         ondelete='set null',
         copy=False,
-        tracking=True
+        tracking=True,
+        index='btree_not_null'
     )
     project_reference = fields.Char(
         string="Project Reference",
-        related='project_csl_id.project_reference',
+        compute='_compute_project_reference',
         store=True,
-        readonly=True
+        readonly=True,
+        index='btree_not_null'
     )
 
+    @api.depends('project_csl_id')
+    def _compute_project_reference(self):
+        """Reference changes on the project are propagated by project.csl._sync_document_references."""
+        for move in self:
+            move.project_reference = move.project_csl_id.project_reference
+
+    def init(self):
+        super().init()
+        # Invoice and vendor bill domains of project.csl filter on both columns
+        tools.create_index(
+            self.env.cr, 'account_move_project_csl_id_move_type_index',
+            self._table, ['project_csl_id', 'move_type'],
+            where='project_csl_id IS NOT NULL',
+        )
+
+    # --- Origin Resolution ---
+
+    @api.model
+    def _get_origin_names(self, move_type, invoice_origin, ref):
+        """Split the origin of a move into the order names it refers to.
+
+        Customer invoices only look at invoice_origin, vendor bills fall back
+        to ref. Multi-origin values like "S00012, S00013" are split on commas.
+        """
+        if move_type in ('out_invoice', 'out_refund'):
+            origin = invoice_origin
+        elif move_type in ('in_invoice', 'in_refund'):
+            origin = invoice_origin or ref
+        else:
+            return []
+        return [name.strip() for name in (origin or '').split(',') if name.strip()]
+
+    @api.model
+    def _get_origin_project_map(self, names_by_model):
+        """Map order names to project ids with one query per order model.
+
+        :param names_by_model: dict {'sale.order'|'purchase.order': set of names}
+        :return: dict {model: {order name: project id}}
+        """
+        project_map = {}
+        for model_name, names in names_by_model.items():
+            project_map[model_name] = {}
+            if not names:
+                continue
+            orders = self.env[model_name].search_fetch([
+                ('name', 'in', list(names)),
+                ('project_csl_id', '!=', False),
+            ], ['name', 'project_csl_id'], order='id')
+            for order in orders:
+                project_map[model_name].setdefault(order.name, order.project_csl_id.id)
+        return project_map
+
+    @api.model
+    def _resolve_origin_projects(self, origins):
+        """Resolve a batch of move origins to projects.
+
+        :param origins: list of (move_type, invoice_origin, ref) tuples
+        :return: list of project ids (or False), in the same order as origins
+        """
+        names_list = []
+        names_by_model = {model_name: set() for model_name in set(ORIGIN_MODEL_BY_MOVE_TYPE.values())}
+        for move_type, invoice_origin, ref in origins:
+            names = self._get_origin_names(move_type, invoice_origin, ref)
+            names_list.append(names)
+            if names:
+                names_by_model[ORIGIN_MODEL_BY_MOVE_TYPE[move_type]].update(names)
+
+        project_map = self._get_origin_project_map(names_by_model)
+
+        project_ids = []
+        for (move_type, _invoice_origin, _ref), names in zip(origins, names_list):
+            model_map = project_map.get(ORIGIN_MODEL_BY_MOVE_TYPE.get(move_type), {})
+            project_ids.append(next((model_map[name] for name in names if name in model_map), False))
+        return project_ids
+
     @api.model_create_multi
+    @instrumented
     def create(self, vals_list):
         """Inherit project from Sale Order or Purchase Order when creating invoice/bill."""
-        for vals in vals_list:
-            # Skip if project is already set
-            if vals.get('project_csl_id'):
-                continue
-                
-            move_type = vals.get('move_type')
-            
-            # For Customer Invoices - get project from Sale Order
-            if move_type in ('out_invoice', 'out_refund'):
-                invoice_origin = vals.get('invoice_origin')
-                if invoice_origin:
-                    # Find the sale order by name
-                    sale_order = self.env['sale.order'].search([
-                        ('name', '=', invoice_origin)
-                    ], limit=1)
-                    if sale_order and sale_order.project_csl_id:
-                        vals['project_csl_id'] = sale_order.project_csl_id.id
-            
-            # For Vendor Bills - get project from Purchase Order
-            elif move_type in ('in_invoice', 'in_refund'):
-                # Check if there's a purchase order reference
-                invoice_origin = vals.get('invoice_origin') or vals.get('ref')
-                if invoice_origin:
-                    # Find the purchase order by name
-                    purchase_order = self.env['purchase.order'].search([
-                        ('name', '=', invoice_origin)
-                    ], limit=1)
-                    if purchase_order and purchase_order.project_csl_id:
-                        vals['project_csl_id'] = purchase_order.project_csl_id.id
+        # Skip moves whose project is already set
+        vals_to_resolve = [vals for vals in vals_list if not vals.get('project_csl_id')]
+        if vals_to_resolve:
+            default_move_type = self.env.context.get('default_move_type')
+            project_ids = self._resolve_origin_projects([
+                (
+                    vals.get('move_type', default_move_type),
+                    vals.get('invoice_origin'),
+                    vals.get('ref'),
+                )
+                for vals in vals_to_resolve
+            ])
+            for vals, project_id in zip(vals_to_resolve, project_ids):
+                if project_id:
+                    vals['project_csl_id'] = project_id
         
-        return super(AccountMove, self).create(vals_list)
+        moves = super(AccountMove, self).create(vals_list)
+        self.env['project.csl.financial.summary']._mark_projects_dirty(moves.project_csl_id.ids)
+        return moves
 
+    @instrumented
     def write(self, vals):
         """Update project reference when invoice_origin changes."""
+        old_project_ids = self.project_csl_id.ids
         res = super(AccountMove, self).write(vals)
         
         # If invoice_origin is updated, try to fetch project
         if 'invoice_origin' in vals or 'ref' in vals:
-            for move in self:
-                if move.project_csl_id:
-                    continue  # Skip if already has project
-                    
-                # For Customer Invoices
-                if move.move_type in ('out_invoice', 'out_refund') and move.invoice_origin:
-                    sale_order = self.env['sale.order'].search([
-                        ('name', '=', move.invoice_origin)
-                    ], limit=1)
-                    if sale_order and sale_order.project_csl_id:
-                        move.project_csl_id = sale_order.project_csl_id.id
-                
-                # For Vendor Bills
-                elif move.move_type in ('in_invoice', 'in_refund'):
-                    ref = move.invoice_origin or move.ref
-                    if ref:
-                        purchase_order = self.env['purchase.order'].search([
-                            ('name', '=', ref)
-                        ], limit=1)
-                        if purchase_order and purchase_order.project_csl_id:
-                            move.project_csl_id = purchase_order.project_csl_id.id
+            self._link_projects_from_origin()
+
+        self.env['project.csl.financial.summary']._mark_projects_dirty(
+            old_project_ids + self.project_csl_id.ids)
         
         return res
 
+    def unlink(self):
+        self.env['project.csl.financial.summary']._mark_projects_dirty(self.project_csl_id.ids)
+        return super().unlink()
+
+    def _compute_amount(self):
+        super()._compute_amount()
+        self._mark_paid_amounts_dirty()
+
+    def _compute_payment_state(self):
+        super()._compute_payment_state()
+        self._mark_paid_amounts_dirty()
+
+    def _mark_paid_amounts_dirty(self):
+        """Reconciliation changes residuals through recomputation, not write()."""
+        moves = self.filtered(lambda move: isinstance(move.id, int) and move.project_csl_id)
+        if moves:
+            self.env['project.csl.financial.summary']._mark_projects_dirty(moves.project_csl_id.ids)
+
+    def _link_projects_from_origin(self):
+        """Link moves without a project to the project of their origin order.
+
+        Origins of the whole recordset are resolved in one lookup and the moves
+        are written once per target project.
+        """
+        moves = self.filtered(lambda move: not move.project_csl_id)
+        if not moves:
+            return
+        project_ids = self._resolve_origin_projects([
+            (move.move_type, move.invoice_origin, move.ref) for move in moves
+        ])
+        moves_by_project = {}
+        for move, project_id in zip(moves, project_ids):
+            if project_id:
+                moves_by_project.setdefault(project_id, []).append(move.id)
+        for project_id, move_ids in moves_by_project.items():
+            self.browse(move_ids).write({'project_csl_id': project_id})
+
+    @instrumented
     def action_view_project(self):
         """Smart button action to view the related project."""
         self.ensure_one()
@@ -0,0 +1,156 @@
+# -*- coding: utf-8 -*-
+import logging
+import time
+
+from odoo import models, fields, api
+from .account_move import ORIGIN_MODEL_BY_MOVE_TYPE
+
+_logger = logging.getLogger(__name__)
+
+
+class ProjectCslMoveBackfill(models.Model):
+    """Progress of the backfill linking existing moves to their origin project.
+
+    Moves are walked in id order, a chunk at a time, and the last processed id
+    is committed together with each chunk. An interrupted run resumes after
+    that id, and once the backlog is done later runs only look at new moves.
+    """
+    _name = 'project.csl.move.backfill'
+    _description = 'Project Invoice Backfill'
+    _rec_name = 'last_move_id'
+
+    state = fields.Selection([
+        ('running', 'Running'),
+        ('done', 'Up to Date'),
+    ], string='Status', default='running', required=True, readonly=True)
+    last_move_id = fields.Integer(string='Last Processed Move', readonly=True)
+    moves_total = fields.Integer(string='Moves to Scan', readonly=True)
+    moves_scanned = fields.Integer(string='Moves Scanned', readonly=True)
+    moves_linked = fields.Integer(string='Moves Linked', readonly=True)
+    progress = fields.Float(string='Progress', compute='_compute_progress')
+    date_start = fields.Datetime(string='Started', readonly=True)
+    date_done = fields.Datetime(string='Completed', readonly=True)
+
+    @api.depends('moves_total', 'moves_scanned')
+    def _compute_progress(self):
+        for backfill in self:
+            if backfill.moves_total:
+                backfill.progress = min(100.0, 100.0 * backfill.moves_scanned / backfill.moves_total)
+            else:
+                backfill.progress = 100.0 if backfill.state == 'done' else 0.0
+
+    @api.model
+    def _get_backfill(self):
+        return self.search([], limit=1) or self.create({})
+
+    def _count_orphan_moves(self):
+        self.env.cr.execute("""
+            SELECT COUNT(*)
+              FROM account_move
+             WHERE id > %s
+               AND project_csl_id IS NULL
+               AND move_type IN %s
+               AND (invoice_origin IS NOT NULL OR ref IS NOT NULL)
+        """, [self.last_move_id, tuple(ORIGIN_MODEL_BY_MOVE_TYPE)])
+        return self.env.cr.fetchone()[0]
+
+    def _backfill_chunk(self, chunk_size):
+        """Link the next chunk of orphan moves and advance the cursor.
+
+        :return: number of moves scanned, 0 once every move has been seen
+        """
+        self.ensure_one()
+        cr = self.env.cr
+        cr.execute("""
+            SELECT id, move_type, invoice_origin, ref
+              FROM account_move
+             WHERE id > %s
+               AND project_csl_id IS NULL
+               AND move_type IN %s
+               AND (invoice_origin IS NOT NULL OR ref IS NOT NULL)
+          ORDER BY id
+             LIMIT %s
+        """, [self.last_move_id, tuple(ORIGIN_MODEL_BY_MOVE_TYPE), chunk_size])
+        rows = cr.fetchall()
+        if not rows:
+            return 0
+
+        project_ids = self.env['account.move']._resolve_origin_projects([row[1:] for row in rows])
+        links = [(row[0], project_id) for row, project_id in zip(rows, project_ids) if project_id]
+        if links:
+            # Plain SQL on purpose: historical moves must not get a tracking message each
+            cr.execute("""
+                UPDATE account_move move
+                   SET project_csl_id = link.project_id,
+                       project_reference = project.project_reference,
+                       write_uid = %s,
+                       write_date = NOW() AT TIME ZONE 'UTC'
+                  FROM (SELECT UNNEST(%s::int[]) AS move_id, UNNEST(%s::int[]) AS project_id) link
+                  JOIN project_csl project ON project.id = link.project_id
+                 WHERE move.id = link.move_id
+                   AND move.project_csl_id IS NULL
+            """, [self.env.uid, [move_id for move_id, _ in links], [project_id for _, project_id in links]])
+            self.env['account.move'].invalidate_model(['project_csl_id', 'project_reference'])
+            projects = self.env['project.csl'].browse({project_id for _, project_id in links})
+            # The UPDATE bypasses the ORM, so the stored counters are recomputed by hand
+            projects.invalidate_recordset(['invoice_ids', 'project_bill_ids'])
+            self.env.add_to_compute(projects._fields['invoice_count'], projects)
+            self.env.add_to_compute(projects._fields['project_bill_count'], projects)
+            projects.flush_recordset(['invoice_count', 'project_bill_count'])
+            self.env['project.csl.financial.summary']._mark_projects_dirty(projects.ids)
+
+        self.write({
+            'last_move_id': rows[-1][0],
+            'moves_scanned': self.moves_scanned + len(rows),
+            'moves_linked': self.moves_linked + len(links),
+        })
+        return len(rows)
+
+    @api.model
+    def _cron_backfill(self, chunk_size=1000, time_limit=240):
+        """Link orphan moves chunk by chunk, committing after each chunk."""
+        backfill = self._get_backfill()
+        if backfill.state == 'done':
+            # Keep up with moves created since the last run
+            backfill.write({
+                'state': 'running',
+                'moves_total': backfill._count_orphan_moves(),
+                'moves_scanned': 0,
+                'moves_linked': 0,
+                'date_start': fields.Datetime.now(),
+                'date_done': False,
+            })
+        elif not backfill.date_start:
+            backfill.write({
+                'moves_total': backfill._count_orphan_moves(),
+                'date_start': fields.Datetime.now(),
+            })
+        self.env.cr.commit()
+
+        start = time.monotonic()
+        while time.monotonic() - start < time_limit:
+            if not backfill._backfill_chunk(chunk_size):
+                backfill.write({'state': 'done', 'date_done': fields.Datetime.now()})
+                self.env.cr.commit()
+                _logger.info("Invoice backfill done: %s moves scanned, %s linked to a project",
+                             backfill.moves_scanned, backfill.moves_linked)
+                return
+            self.env.cr.commit()
+
+        _logger.info("Invoice backfill paused at move %s: %s/%s moves scanned, %s linked",
+                     backfill.last_move_id, backfill.moves_scanned, backfill.moves_total, backfill.moves_linked)
+        # Out of time, come back for the remaining moves
+        self.env.ref('concept_project_management.ir_cron_project_csl_move_backfill')._trigger()
+
+    def action_restart(self):
+        """Scan every move again from the start."""
+        self.write({
+            'state': 'running',
+            'last_move_id': 0,
+            'moves_total': 0,
+            'moves_scanned': 0,
+            'moves_linked': 0,
+            'date_start': False,
+            'date_done': False,
+        })
+        self.env.ref('concept_project_management.ir_cron_project_csl_move_backfill').sudo()._trigger()
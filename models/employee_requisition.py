@@ -1,6 +1,8 @@
 # -*- coding: utf-8 -*-
-from odoo import models, fields
+from odoo import models, fields, api
 
+# Not imported by models/__init__.py: this extension, including its
+# indexes, only applies once the import there is enabled.
 class EmployeePurchaseRequisition(models.Model):
     _inherit = 'employee.purchase.requisition'
 
@@ -10,15 +12,23 @@ class EmployeePurchaseRequisition(models.Model):
         help="Linked Project",
         ondelete='set null',
         copy=False,
-        tracking=True
+        tracking=True,
+        index='btree_not_null'
     )
     project_reference = fields.Char(
         string="Project Reference",
-        related='project_csl_id.project_reference',
+        compute='_compute_project_reference',
         store=True,
-        readonly=True
+        readonly=True,
+        index='btree_not_null'
     )
 
+    @api.depends('project_csl_id')
+    def _compute_project_reference(self):
+        """Reference changes on the project are propagated by project.csl._sync_document_references."""
+        for requisition in self:
+            requisition.project_reference = requisition.project_csl_id.project_reference
+
     def action_view_project(self):
         """Smart button action to view the related project."""
         self.ensure_one()
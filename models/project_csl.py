@@ -1,6 +1,34 @@
 # -*- coding: utf-8 -*-
-from odoo import models, fields, api
+import logging
+from collections import defaultdict
+from datetime import date
+
+from odoo import models, fields, api, tools
+from .project_csl_perf_log import instrumented
 from odoo.exceptions import UserError
+from odoo.tools.query import Query
+from odoo.tools.sql import SQL, escape_psql
+
+_logger = logging.getLogger(__name__)
+
+# Statuses a project may come from, by target status
+STATE_TRANSITIONS = {
+    'confirm': ('draft',),
+    'done': ('confirm',),
+    'draft': ('confirm', 'done'),
+}
+
+# System parameter switching the project form to lazily loaded document pages
+LAZY_FORM_PARAM = 'concept_project_management.lazy_project_form'
+
+# Text columns of project.csl covered by the free-text search
+SEARCH_TEXT_FIELDS = [
+    'name', 'project_reference', 'estimated_cost_details',
+    'budget_details', 'task_duties_details', 'cost_details',
+]
+
+# Tables of linked documents whose name is covered by the free-text search
+SEARCH_DOCUMENT_TABLES = ['sale_order', 'purchase_order', 'account_move']
 
 class ProjectCsl(models.Model):
     _name = 'project.csl'
@@ -8,7 +36,7 @@ class ProjectCsl(models.Model):
     _inherit = ['mail.thread', 'mail.activity.mixin']
 
     name = fields.Char(string='Project Title', required=True, tracking=True)
-    project_reference = fields.Char(string='Project Reference', readonly=True, copy=False, tracking=True)
+    project_reference = fields.Char(string='Project Reference', readonly=True, copy=False, tracking=True, index=True)
 
     # Customer field (Project Co-ordinator)
     partner_id = fields.Many2one(
@@ -40,10 +68,11 @@ class ProjectCsl(models.Model):
     # Page 1: Project Details
     scope_work_set_id = fields.Many2one('scope.work.set', string='Scope of Work')
     project_scope_line_ids = fields.One2many('project.scope.line', 'project_id', string='Project Scope Lines')
+    scope_work_preview = fields.Text(string='Scope Preview', compute='_compute_scope_work_preview')
 
     # Page 2: Quotation
     project_quotation_line_ids = fields.One2many('project.quotation.line', 'project_id', string='Quotation Lines')
-    quotation_count = fields.Integer(string='Quotation Count', compute='_compute_quotation_count')
+    quotation_count = fields.Integer(string='Quotation Count', compute='_compute_quotation_count', store=True)
     
     # Page 3: Invoice
     invoice_ids = fields.One2many(
@@ -52,7 +81,7 @@ class ProjectCsl(models.Model):
         string='Invoices', 
         domain=[('move_type', '=', 'out_invoice')]
     )
-    invoice_count = fields.Integer(string='Number of Invoices', compute='_compute_invoice_count')
+    invoice_count = fields.Integer(string='Number of Invoices', compute='_compute_invoice_count', store=True)
 
     # Page 4: Purchase Order
     project_purchase_line_ids = fields.One2many(
@@ -60,7 +89,7 @@ class ProjectCsl(models.Model):
         'project_id',
         string='Purchase Order Lines'
     )
-    purchase_order_count = fields.Integer(string='Purchase Order Count', compute='_compute_purchase_order_count')
+    purchase_order_count = fields.Integer(string='Purchase Order Count', compute='_compute_purchase_order_count', store=True)
 
     # Page 5: Purchase (Vendor Bills)
     project_bill_ids = fields.One2many(
@@ -69,7 +98,7 @@ class ProjectCsl(models.Model):
         string='Vendor Bills',
         domain=[('move_type', '=', 'in_invoice')]
     )
-    project_bill_count = fields.Integer(string='Vendor Bill Count', compute='_compute_project_bill_count')
+    project_bill_count = fields.Integer(string='Vendor Bill Count', compute='_compute_project_bill_count', store=True)
 
     # Page 6: Employee
     employee_ids = fields.Many2many(
@@ -88,78 +117,316 @@ class ProjectCsl(models.Model):
     )
     employee_requisition_count = fields.Integer(
         string='Purchase Request Count', 
-        compute='_compute_employee_requisition_count'
+        compute='_compute_employee_requisition_count',
+        store=True
     )
     
+    # Structured budget
+    budget_line_ids = fields.One2many('project.csl.budget.line', 'project_id', string='Budget Lines')
+
     # Other Notebook fields
     estimated_cost_details = fields.Text(string='Estimated Cost Details')
     budget_details = fields.Text(string='Budget Details')
     task_duties_details = fields.Text(string='Task & Duties Details')
     cost_details = fields.Text(string='Cost Details')
+
+    # Free-text search over the project, its pages and linked documents
+    search_text = fields.Char(string='Search', compute='_compute_search_text', search='_search_search_text')
+
+    # Background jobs
+    job_ids = fields.One2many('project.csl.job', 'project_id', string='Background Jobs')
+    job_pending_count = fields.Integer(string='Pending Jobs', compute='_compute_job_progress')
+    job_progress = fields.Float(string='Job Progress', compute='_compute_job_progress')
     
+    def init(self):
+        # Version stamp of the KPI data, see _bump_kpi_version()
+        self.env.cr.execute("CREATE SEQUENCE IF NOT EXISTS project_csl_kpi_version_seq")
+        self._create_search_indexes()
+
     # --- Compute & Onchange ---
 
+    def _get_grouped_counts(self, model_name, project_field, domain=None, aggregate='__count'):
+        """Count related records for the whole batch with a single GROUP BY query.
+
+        :return: dict {project id: count}
+        """
+        project_ids = [pid for pid in self._origin.ids if pid]
+        if not project_ids:
+            return {}
+        groups = self.env[model_name]._read_group(
+            [(project_field, 'in', project_ids)] + (domain or []),
+            groupby=[project_field],
+            aggregates=[aggregate],
+        )
+        return {project.id: count for project, count in groups}
+
     @api.depends('project_quotation_line_ids.quotation_id')
     def _compute_quotation_count(self):
+        counts = self._get_grouped_counts(
+            'project.quotation.line', 'project_id', aggregate='quotation_id:count_distinct')
         for rec in self:
-            rec.quotation_count = len(rec.project_quotation_line_ids.quotation_id)
+            rec.quotation_count = counts.get(rec._origin.id, 0)
 
     @api.depends('invoice_ids')
     def _compute_invoice_count(self):
+        counts = self._get_grouped_counts(
+            'account.move', 'project_csl_id', [('move_type', '=', 'out_invoice')])
         for rec in self:
-            rec.invoice_count = len(rec.invoice_ids)
+            rec.invoice_count = counts.get(rec._origin.id, 0)
             
     @api.depends('project_purchase_line_ids.purchase_order_id')
     def _compute_purchase_order_count(self):
+        counts = self._get_grouped_counts(
+            'project.purchase.line', 'project_id', aggregate='purchase_order_id:count_distinct')
         for rec in self:
-            rec.purchase_order_count = len(rec.project_purchase_line_ids.purchase_order_id)
+            rec.purchase_order_count = counts.get(rec._origin.id, 0)
             
     @api.depends('project_bill_ids')
     def _compute_project_bill_count(self):
+        counts = self._get_grouped_counts(
+            'account.move', 'project_csl_id', [('move_type', '=', 'in_invoice')])
         for rec in self:
-            rec.project_bill_count = len(rec.project_bill_ids)
+            rec.project_bill_count = counts.get(rec._origin.id, 0)
 
     @api.depends('employee_requisition_line_ids')
     def _compute_employee_requisition_count(self):
+        counts = self._get_grouped_counts('project.employee.requisition.line', 'project_id')
         for rec in self:
-            rec.employee_requisition_count = len(rec.employee_requisition_line_ids)
+            rec.employee_requisition_count = counts.get(rec._origin.id, 0)
+
+    def _compute_job_progress(self):
+        """Progress of the job batches that still have unfinished jobs."""
+        Job = self.env['project.csl.job'].sudo()
+        domain = [('project_id', 'in', [pid for pid in self._origin.ids if pid])]
+        active_batches = [
+            batch_ref for [batch_ref] in Job._read_group(
+                domain + [('state', 'in', ('pending', 'running'))], groupby=['batch_ref'])
+        ]
+        totals = defaultdict(lambda: [0, 0])  # project id: [finished, total]
+        if active_batches:
+            groups = Job._read_group(
+                domain + [('batch_ref', 'in', active_batches)],
+                groupby=['project_id', 'state'],
+                aggregates=['__count'],
+            )
+            for project, state, count in groups:
+                totals[project.id][1] += count
+                if state in ('done', 'failed'):
+                    totals[project.id][0] += count
+        for rec in self:
+            finished, total = totals.get(rec._origin.id, (0, 0))
+            rec.job_pending_count = total - finished
+            rec.job_progress = 100.0 * finished / total if total else 0.0
             
-    @api.onchange('scope_work_set_id')
-    def _onchange_scope_work_set_id(self):
-        """Populate project scope lines from the selected set."""
-        if not self.scope_work_set_id:
-            self.project_scope_line_ids = [(5, 0, 0)]
+    @api.depends('scope_work_set_id')
+    def _compute_scope_work_preview(self):
+        """Line count and first lines of the selected set; the lines themselves
+        are copied on the server when the project is saved."""
+        ScopeWorkLine = self.env['scope.work.line']
+        counts = dict(ScopeWorkLine._read_group(
+            [('set_id', 'in', self.scope_work_set_id.ids)], groupby=['set_id'], aggregates=['__count']))
+        for rec in self:
+            if not rec.scope_work_set_id:
+                rec.scope_work_preview = False
+                continue
+            first_lines = ScopeWorkLine.search_fetch(
+                [('set_id', '=', rec.scope_work_set_id.id)], ['name'], limit=5)
+            preview = [f"{counts.get(rec.scope_work_set_id, 0)} line(s) will be copied on save:"]
+            preview += [f"- {line.name}" for line in first_lines]
+            if counts.get(rec.scope_work_set_id, 0) > len(first_lines):
+                preview.append("...")
+            rec.scope_work_preview = "\n".join(preview)
+
+    @api.onchange('employee_ids', 'date_start', 'date_end')
+    def _onchange_employee_allocation(self):
+        """Warn before saving when an employee is already booked on another project."""
+        conflicts = self.env['project.csl.employee.allocation']._get_project_conflicts(self)
+        if not conflicts:
             return
+        employees = self.env['hr.employee'].browse({conflict['employee_id'] for conflict in conflicts})
+        projects = self.browse({
+            project_id
+            for conflict in conflicts
+            for project_id in (conflict['project_id'], conflict['other_project_id'])
+            if project_id
+        })
+        lines = []
+        for conflict in conflicts[:10]:
+            other_project = projects.browse(conflict['project_id'] or conflict['other_project_id'])
+            lines.append(f"- {employees.browse(conflict['employee_id']).name}: {other_project.display_name} "
+                         f"({conflict['date_from']} to {conflict['date_to'] if conflict['date_to'] != date.max else 'open-ended'})")
+        if len(conflicts) > 10:
+            lines.append(f"... and {len(conflicts) - 10} more")
+        return {'warning': {
+            'title': "Employees already allocated",
+            'message': "These employees are assigned to other projects over the same period:\n" + "\n".join(lines),
+        }}
 
-        lines_to_create = []
-        for line in self.scope_work_set_id.work_line_ids:
-            lines_to_create.append((0, 0, {
-                'name': line.name,
-                'sequence': line.sequence,
-            }))
-        
-        self.project_scope_line_ids = [(5, 0, 0)] 
-        self.project_scope_line_ids = lines_to_create
+    def _sync_scope_lines_from_template(self):
+        """Align the scope lines of the projects with their scope of work set.
+
+        Works in three statements for the whole recordset: lines copied from
+        the set get the template's name and sequence back, lines copied from
+        another set are removed and missing template lines are inserted with
+        INSERT ... SELECT. Lines added by hand are left alone.
+
+        :return: tuple (updated, removed, added) line counts
+        """
+        projects = self.filtered('scope_work_set_id')
+        if not projects:
+            return 0, 0, 0
+        self.env['project.scope.line'].flush_model()
+        self.env['scope.work.line'].flush_model()
+        projects.flush_recordset(['scope_work_set_id'])
+        params = {'project_ids': projects.ids, 'uid': self.env.uid}
+
+        self.env.cr.execute("""
+            UPDATE project_scope_line line
+               SET name = tmpl.name,
+                   sequence = tmpl.sequence,
+                   write_uid = %(uid)s,
+                   write_date = (now() at time zone 'UTC')
+              FROM scope_work_line tmpl, project_csl project
+             WHERE line.template_line_id = tmpl.id
+               AND line.project_id = project.id
+               AND tmpl.set_id = project.scope_work_set_id
+               AND project.id = ANY(%(project_ids)s)
+               AND (line.name IS DISTINCT FROM tmpl.name OR line.sequence IS DISTINCT FROM tmpl.sequence)
+        """, params)
+        updated = self.env.cr.rowcount
+
+        self.env.cr.execute("""
+            DELETE FROM project_scope_line line
+             USING scope_work_line tmpl, project_csl project
+             WHERE line.template_line_id = tmpl.id
+               AND line.project_id = project.id
+               AND project.id = ANY(%(project_ids)s)
+               AND tmpl.set_id IS DISTINCT FROM project.scope_work_set_id
+        """, params)
+        removed = self.env.cr.rowcount
+
+        self.env.cr.execute("""
+            INSERT INTO project_scope_line (
+                name, sequence, project_id, template_line_id,
+                create_uid, create_date, write_uid, write_date
+            )
+            SELECT tmpl.name, tmpl.sequence, project.id, tmpl.id,
+                   %(uid)s, (now() at time zone 'UTC'), %(uid)s, (now() at time zone 'UTC')
+              FROM project_csl project
+              JOIN scope_work_line tmpl ON tmpl.set_id = project.scope_work_set_id
+             WHERE project.id = ANY(%(project_ids)s)
+               AND NOT EXISTS (
+                    SELECT 1
+                      FROM project_scope_line line
+                     WHERE line.project_id = project.id
+                       AND line.template_line_id = tmpl.id
+               )
+        """, params)
+        added = self.env.cr.rowcount
+
+        self.env['project.scope.line'].invalidate_model()
+        projects.invalidate_recordset(['project_scope_line_ids'])
+        return updated, removed, added
+
+    def action_resync_scope_lines(self):
+        """Re-sync the scope lines from the scope of work set, applying only the differences."""
+        updated, removed, added = self._sync_scope_lines_from_template()
+        return {
+            'type': 'ir.actions.client',
+            'tag': 'display_notification',
+            'params': {
+                'title': "Scope of work re-synced",
+                'message': f"{added} line(s) added, {updated} updated, {removed} removed.",
+                'type': 'success',
+                'next': {'type': 'ir.actions.client', 'tag': 'soft_reload'},
+            },
+        }
 
     # --- Sequence ---
     
-    @api.model
-    def create(self, vals):
-        company_id = vals.get('company_id') or self.env.company.id
-        if not vals.get('project_reference'):
-            seq = self._get_or_create_company_sequence(company_id)
-            vals['project_reference'] = seq.next_by_id() or '/'
+    @api.model_create_multi
+    @instrumented
+    def create(self, vals_list):
+        # Reserve all references of a company in one sequence operation
+        vals_by_company = defaultdict(list)
+        for vals in vals_list:
+            if not vals.get('project_reference'):
+                company_id = vals.get('company_id') or self.env.company.id
+                vals_by_company[company_id].append(vals)
+
+        for company_id, company_vals_list in vals_by_company.items():
+            references = self._reserve_project_references(company_id, len(company_vals_list))
+            for vals, reference in zip(company_vals_list, references):
+                vals['project_reference'] = reference or '/'
 
-        project = super(ProjectCsl, self).create(vals)
-        return project
+        projects = super(ProjectCsl, self).create(vals_list)
+        self.env['project.csl.financial.summary']._mark_projects_dirty(projects.ids)
+
+        # Copy the scope of work set, lines given explicitly are kept
+        projects._sync_scope_lines_from_template()
+        return projects
+
+    def _reserve_project_references(self, company_id, count):
+        """Return `count` consecutive project references of the company sequence.
+
+        Gapless sequences are advanced by the whole block with a single UPDATE,
+        so the row lock is taken once per batch instead of once per project.
+        Standard sequences draw the block from their PostgreSQL sequence.
+        """
+        seq = self.env['ir.sequence'].sudo().browse(self._get_company_sequence_id(company_id)).exists()
+        if not seq:
+            # The cached sequence was removed (or its creation rolled back)
+            self.env.registry.clear_cache()
+            seq = self.env['ir.sequence'].sudo().browse(self._get_company_sequence_id(company_id))
+        self._apply_reference_implementation(seq)
+
+        if seq.use_date_range:
+            return [seq.next_by_id() for _i in range(count)]
+
+        if seq.implementation == 'standard':
+            self.env.cr.execute(
+                "SELECT nextval(%s) FROM generate_series(1, %s)",
+                ('ir_sequence_%03d' % seq.id, count),
+            )
+            numbers = [row[0] for row in self.env.cr.fetchall()]
+        else:
+            self.env.cr.execute("""
+                UPDATE ir_sequence
+                   SET number_next = number_next + %(count)s * number_increment
+                 WHERE id = %(seq_id)s
+             RETURNING number_next - %(count)s * number_increment, number_increment
+            """, {'count': count, 'seq_id': seq.id})
+            number_start, number_increment = self.env.cr.fetchone()
+            numbers = [number_start + i * number_increment for i in range(count)]
+            seq.invalidate_recordset(['number_next'])
+
+        return [seq.get_next_char(number) for number in numbers]
+
+    @tools.ormcache('company_id')
+    def _get_company_sequence_id(self, company_id):
+        """Cached company -> reference sequence id, shared by the registry."""
+        return self.sudo()._get_or_create_company_sequence(company_id).id
 
     def _get_or_create_company_sequence(self, company_id):
-        """Ensure each company has its own independent sequence."""
+        """Ensure each company has its own independent sequence.
+
+        The first use of a company is serialized with a transaction-level
+        advisory lock, and the search is repeated once the lock is held, so
+        concurrent creators do not each copy their own sequence.
+        """
         IrSequence = self.env['ir.sequence']
-        company_seq = IrSequence.search([
+        domain = [
             ('code', '=', 'project.csl.reference'),
             ('company_id', '=', company_id)
-        ], limit=1)
+        ]
+        company_seq = IrSequence.search(domain, limit=1)
+
+        if not company_seq:
+            self.env.cr.execute(
+                "SELECT pg_advisory_xact_lock(hashtext('project_csl_reference_sequence'), %s)",
+                (company_id,),
+            )
+            company_seq = IrSequence.search(domain, limit=1)
 
         if not company_seq:
             base_seq = IrSequence.search([
@@ -181,47 +448,314 @@ class ProjectCsl(models.Model):
                 })
         return company_seq
 
+    @api.model
+    def _apply_reference_implementation(self, seq):
+        """Align a reference sequence with the configured implementation.
+
+        Sequences are gapless by default. Setting the system parameter
+        ``concept_project_management.reference_implementation`` to
+        ``standard`` switches them to a standard PostgreSQL sequence, which
+        does not lock under concurrent creation but may leave gaps. This is
+        checked on every reservation, outside the cached company -> sequence
+        lookup, so changing the parameter applies without a restart.
+        """
+        implementation = self.env['ir.config_parameter'].sudo().get_param(
+            'concept_project_management.reference_implementation')
+        if implementation in ('standard', 'no_gap') and seq.implementation != implementation:
+            seq.implementation = implementation
+
+    @instrumented
     def write(self, vals):
         res = super().write(vals)
+        self._bump_kpi_version()
+        if 'scope_work_set_id' in vals:
+            if 'project_scope_line_ids' not in vals:
+                # A new set replaces the current lines
+                self.project_scope_line_ids.unlink()
+            self._sync_scope_lines_from_template()
+        if 'company_id' in vals:
+            self.env['project.csl.financial.summary']._mark_projects_dirty(self.ids)
+        if 'project_reference' in vals:
+            if len(self) == 1 and not self.env.context.get('project_csl_defer_reference_sync'):
+                self._sync_document_references()
+            else:
+                self.env['project.csl.job']._enqueue(
+                    self, '_sync_document_references', name="Sync project references", chunk_size=50)
         return res
+
+    # --- Search ---
+
+    def _compute_search_text(self):
+        self.search_text = False
+
+    def _search_search_text(self, operator, value):
+        if operator not in ('ilike', 'like', '=') or not isinstance(value, str):
+            raise UserError("Unsupported search on projects.")
+        # Matching ids stay a subquery instead of being inlined in the domain
+        return [('id', 'in', Query(self.env, 'project_csl_search_match', SQL(
+            "(%s)", self._get_search_match_query(value))))]
+
+    @api.model
+    def _create_search_indexes(self):
+        """Trigram GIN indexes for the searched text columns (needs pg_trgm).
+
+        Linked document names get partial indexes restricted to documents
+        that have a project, which is the predicate the search uses.
+        """
+        if not self.env.registry.has_trigram:
+            _logger.info("pg_trgm is not installed, project text search will not use indexes")
+            return
+        for field_name in SEARCH_TEXT_FIELDS:
+            tools.create_index(
+                self.env.cr, f'project_csl_{field_name}_trgm_index', self._table,
+                [f'"{field_name}" gin_trgm_ops'], method='gin',
+            )
+        for table in SEARCH_DOCUMENT_TABLES:
+            tools.create_index(
+                self.env.cr, f'{table}_project_csl_name_trgm_index', table,
+                ['"name" gin_trgm_ops'], method='gin', where='project_csl_id IS NOT NULL',
+            )
+
+    @api.model
+    def _get_search_match_query(self, term):
+        """Ids of the projects matching `term`, as a UNION of indexable branches.
+
+        Each branch filters a single trigram-indexed column, so PostgreSQL can
+        use one index scan per branch instead of scanning project_csl and
+        probing the documents of every project.
+        """
+        pattern = f"%{escape_psql(term.strip())}%"
+        branches = [
+            SQL("SELECT id FROM project_csl WHERE %s ILIKE %s", SQL.identifier(fname), pattern)
+            for fname in SEARCH_TEXT_FIELDS
+        ] + [
+            SQL("SELECT project_csl_id FROM %s WHERE project_csl_id IS NOT NULL AND name ILIKE %s",
+                SQL.identifier(table), pattern)
+            for table in SEARCH_DOCUMENT_TABLES
+        ]
+        return SQL(" UNION ").join(branches)
+
+    @api.model
+    def _search_ranked_ids(self, term, limit=None):
+        """Project ids matching `term` in their text fields or linked document names.
+
+        Results are ranked by trigram similarity when pg_trgm is available,
+        newest first otherwise.
+
+        :return: list of (project id, score) tuples, best match first
+        """
+        self.env.flush_all()
+        if self.env.registry.has_trigram:
+            score = SQL("GREATEST(%s)", SQL(", ").join(
+                SQL("word_similarity(%s, COALESCE(project.%s, ''))", term, SQL.identifier(fname))
+                for fname in SEARCH_TEXT_FIELDS
+            ))
+        else:
+            score = SQL("0")
+        self.env.cr.execute(SQL("""
+            SELECT project.id, %s AS score
+              FROM project_csl project
+              JOIN (%s) matched ON matched.id = project.id
+          ORDER BY score DESC, project.id DESC
+             %s
+        """, score, self._get_search_match_query(term), SQL("LIMIT %s", limit) if limit else SQL()))
+        return self.env.cr.fetchall()
+
+    @api.model
+    def search_ranked(self, term, limit=80):
+        """Projects matching `term`, best match first, within the user's access."""
+        ranked_ids = [project_id for project_id, _score in self._search_ranked_ids(term, limit)]
+        allowed = set(self.search([('id', 'in', ranked_ids)]).ids)
+        return self.browse([project_id for project_id in ranked_ids if project_id in allowed])
+
+    # --- Stored Reference Copies ---
+
+    @api.model
+    def _get_reference_copy_models(self):
+        """Models holding a stored copy of the project reference."""
+        return [
+            model_name
+            for model_name in ('account.move', 'sale.order', 'purchase.order', 'employee.purchase.requisition')
+            if model_name in self.env and 'project_reference' in self.env[model_name]._fields
+        ]
+
+    def _sync_document_references(self):
+        """Copy the reference of the projects onto their documents, one UPDATE per table."""
+        if not self:
+            return
+        self.flush_recordset(['project_reference'])
+        for model_name in self._get_reference_copy_models():
+            Model = self.env[model_name]
+            Model.flush_model(['project_csl_id', 'project_reference'])
+            self.env.cr.execute(SQL("""
+                UPDATE %s doc
+                   SET project_reference = project.project_reference
+                  FROM project_csl project
+                 WHERE doc.project_csl_id = project.id
+                   AND project.id IN %s
+                   AND doc.project_reference IS DISTINCT FROM project.project_reference
+            """, SQL.identifier(Model._table), tuple(self.ids)))
+            Model.invalidate_model(['project_reference'])
+
+    @api.model
+    def _check_document_references(self, repair=False):
+        """Find (and optionally repair) stale project reference copies.
+
+        :return: dict {model name: number of stale documents}
+        """
+        self.env.flush_all()
+        stale_counts = {}
+        for model_name in self._get_reference_copy_models():
+            table = SQL.identifier(self.env[model_name]._table)
+            self.env.cr.execute(SQL("""
+                SELECT COUNT(*)
+                  FROM %s doc
+             LEFT JOIN project_csl project ON project.id = doc.project_csl_id
+                 WHERE doc.project_reference IS DISTINCT FROM project.project_reference
+            """, table))
+            stale_counts[model_name] = self.env.cr.fetchone()[0]
+            if repair and stale_counts[model_name]:
+                self.env.cr.execute(SQL("""
+                    UPDATE %s doc
+                       SET project_reference = project.project_reference
+                      FROM project_csl project
+                     WHERE doc.project_csl_id = project.id
+                       AND doc.project_reference IS DISTINCT FROM project.project_reference
+                """, table))
+                self.env.cr.execute(SQL("""
+                    UPDATE %s
+                       SET project_reference = NULL
+                     WHERE project_csl_id IS NULL
+                       AND project_reference IS NOT NULL
+                """, table))
+                self.env[model_name].invalidate_model(['project_reference'])
+        if any(stale_counts.values()):
+            _logger.warning("Stale project references%s: %s", " repaired" if repair else "", stale_counts)
+        return stale_counts
     
     # --- Actions ---
 
+    @instrumented
     def action_create_invoice(self):
         """Create one invoice per selected quotation after verifying they are confirmed."""
         self.ensure_one()
 
-        if not self.project_quotation_line_ids:
-            raise UserError("Please select at least one quotation to create invoices.")
+        created_invoices, errors = self._create_invoices_from_quotations()
+        if errors:
+            raise UserError(errors[self])
 
-        created_invoices = self.env['account.move']
-        quotations_to_invoice = self.project_quotation_line_ids.quotation_id
+        action = self.env.ref('account.action_move_out_invoice_type').read()[0]
+        action['domain'] = [('id', 'in', created_invoices.ids)]
+        return action
 
-        for sale_order in quotations_to_invoice:
-            existing_invoice = self.invoice_ids.filtered(lambda inv: inv.invoice_origin == sale_order.name)
-            if existing_invoice:
-                continue
+    @instrumented
+    def action_create_invoices_batch(self):
+        """Invoice the quotations of all selected projects, reporting failed projects."""
+        created_invoices, errors = self._create_invoices_from_quotations()
 
-            if sale_order.state != 'sale':
-                raise UserError(
-                    f"The quotation '{sale_order.name}' is not confirmed.\n"
-                    f"Please confirm the quotation before creating an invoice."
-                )
+        action = self.env.ref('account.action_move_out_invoice_type').read()[0]
+        action['domain'] = [('id', 'in', created_invoices.ids)]
+        if not errors:
+            return action
 
-            if not sale_order.order_line:
-                raise UserError(f"The quotation '{sale_order.name}' has no products to invoice.")
+        return {
+            'type': 'ir.actions.client',
+            'tag': 'display_notification',
+            'params': {
+                'title': f"{len(errors)} project(s) could not be invoiced",
+                'message': "\n".join(
+                    f"{project.display_name}: {message}" for project, message in errors.items()
+                ),
+                'type': 'warning',
+                'sticky': True,
+                'next': action,
+            },
+        }
 
-            invoice_vals = sale_order._prepare_invoice()
-            invoice_vals['project_csl_id'] = self.id
-            
-            invoice = self.env['account.move'].create(invoice_vals)
-            sale_order.invoice_ids = [(4, invoice.id)]
-            created_invoices |= invoice
+    def action_create_invoices_in_background(self):
+        """Queue one invoicing job per selected project."""
+        for project in self:
+            self.env['project.csl.job']._enqueue(
+                project, '_job_create_invoices', name=f"Create invoices: {project.display_name}", project=project)
+        return {
+            'type': 'ir.actions.client',
+            'tag': 'display_notification',
+            'params': {
+                'title': "Invoicing queued",
+                'message': f"Invoices of {len(self)} project(s) will be created in the background.",
+                'type': 'info',
+            },
+        }
 
-        action = self.env.ref('account.action_move_out_invoice_type').read()[0]
-        action['domain'] = [('id', 'in', created_invoices.ids)]
-        return action
+    def _job_create_invoices(self):
+        """Job entry point: invoice the projects and log failures on their chatter."""
+        _invoices, errors = self._create_invoices_from_quotations()
+        for project, message in errors.items():
+            project.message_post(body=f"Invoices could not be created: {message}")
+
+    def _get_invoiced_origins(self):
+        """Return the (project id, sale order name) pairs that already have an invoice."""
+        invoices = self.env['account.move'].search_fetch([
+            ('project_csl_id', 'in', self.ids),
+            ('move_type', '=', 'out_invoice'),
+            ('invoice_origin', '!=', False),
+        ], ['project_csl_id', 'invoice_origin'])
+        return {
+            (invoice.project_csl_id.id, name.strip())
+            for invoice in invoices
+            for name in invoice.invoice_origin.split(',')
+        }
+
+    def _create_invoices_from_quotations(self):
+        """Create the missing invoices of every project with a single account.move.create.
+
+        All quotations of a project are validated before anything is created;
+        a project with an invalid quotation, or whose invoice values cannot be
+        prepared, is skipped as a whole.
+
+        :return: tuple (created invoices, dict {project: error message})
+        """
+        errors = {}
+        invoiced_origins = self._get_invoiced_origins()
+        sale_orders_to_invoice = []
+
+        for project in self:
+            if not project.project_quotation_line_ids:
+                errors[project] = "Please select at least one quotation to create invoices."
+                continue
+
+            sale_orders = project.project_quotation_line_ids.quotation_id.filtered(
+                lambda so: (project.id, so.name) not in invoiced_origins
+            )
+            for sale_order in sale_orders:
+                if sale_order.state != 'sale':
+                    errors[project] = (
+                        f"The quotation '{sale_order.name}' is not confirmed.\n"
+                        f"Please confirm the quotation before creating an invoice."
+                    )
+                    break
+                if not sale_order.order_line:
+                    errors[project] = f"The quotation '{sale_order.name}' has no products to invoice."
+                    break
+            else:
+                sale_orders_to_invoice.append((project, sale_orders))
+
+        invoice_vals_list = []
+        for project, sale_orders in sale_orders_to_invoice:
+            try:
+                project_invoice_vals = [sale_order._prepare_invoice() for sale_order in sale_orders]
+            except UserError as error:
+                errors[project] = error.args[0]
+                continue
+            for invoice_vals in project_invoice_vals:
+                invoice_vals['project_csl_id'] = project.id
+            invoice_vals_list += project_invoice_vals
+
+        # sale.order.invoice_ids is computed from the invoice lines, nothing to write back
+        created_invoices = self.env['account.move'].create(invoice_vals_list)
+        return created_invoices, errors
         
+    @instrumented
     def action_view_quotations(self):
         self.ensure_one()
         return {
@@ -233,6 +767,7 @@ class ProjectCsl(models.Model):
             'context': {'create': False}
         }
         
+    @instrumented
     def action_view_invoices(self):
         self.ensure_one()
         return {
@@ -244,6 +779,7 @@ class ProjectCsl(models.Model):
             'context': {'create': False, 'default_move_type': 'out_invoice'}
         }
         
+    @instrumented
     def action_view_purchase_orders(self):
         self.ensure_one()
         return {
@@ -255,6 +791,7 @@ class ProjectCsl(models.Model):
             'context': {'create': False}
         }
 
+    @instrumented
     def action_view_vendor_bills(self):
         self.ensure_one()
         return {
@@ -266,6 +803,7 @@ class ProjectCsl(models.Model):
             'context': {'create': False, 'default_move_type': 'in_invoice'}
         }
 
+    @instrumented
     def action_view_employee_requisitions(self):
         self.ensure_one()
         return {
@@ -277,18 +815,297 @@ class ProjectCsl(models.Model):
             'context': {'create': False}
         }
 
+    def action_open_quotation_lines(self):
+        """Paginated, editable list of the quotation lines (lazy form)."""
+        self.ensure_one()
+        return self._action_open_lines('project.quotation.line', "Quotation Lines")
+
+    def action_open_purchase_lines(self):
+        """Paginated, editable list of the purchase order lines (lazy form)."""
+        self.ensure_one()
+        return self._action_open_lines('project.purchase.line', "Purchase Order Lines")
+
+    def _action_open_lines(self, model_name, name):
+        return {
+            'type': 'ir.actions.act_window',
+            'name': f"{name}: {self.display_name}",
+            'res_model': model_name,
+            'view_mode': 'tree',
+            'domain': [('project_id', '=', self.id)],
+            'context': {'default_project_id': self.id, 'project_csl_customer_id': self.customer_id.id},
+        }
+
+    # --- Lazy Form ---
+
+    @api.model
+    def _use_lazy_form(self):
+        return bool(self.env['ir.config_parameter'].sudo().get_param(LAZY_FORM_PARAM))
+
+    @api.model
+    def _get_view_cache_key(self, view_id=None, view_type='form', **options):
+        key = super()._get_view_cache_key(view_id, view_type, **options)
+        if view_type == 'form':
+            key += (self._use_lazy_form(),)
+        return key
+
+    @api.model
+    def _get_view(self, view_id=None, view_type='form', **options):
+        """Serve the lazy project form as default form view when it is enabled.
+
+        Its document pages only show the stored counters and open paginated
+        lists on demand, so opening a project does not read its documents.
+        """
+        if view_type == 'form' and not view_id and self._use_lazy_form():
+            view_id = self.env['ir.model.data']._xmlid_to_res_id(
+                'concept_project_management.project_csl_view_form_lazy', raise_if_not_found=False)
+        return super()._get_view(view_id, view_type, **options)
+
+    # --- Ledger Export ---
+
+    def action_export_ledger_csv(self):
+        return self._action_export_ledger('csv')
+
+    def action_export_ledger_xlsx(self):
+        return self._action_export_ledger('xlsx')
+
+    def _action_export_ledger(self, file_format):
+        return {
+            'type': 'ir.actions.act_url',
+            'url': f"/project_csl/ledger/export?file_format={file_format}"
+                   f"&project_ids={','.join(map(str, self.ids))}",
+            'target': 'self',
+        }
+
+    @api.model
+    def _get_ledger_header(self):
+        return [
+            'Project Reference', 'Project', 'Document Type', 'Document', 'Partner',
+            'Date', 'Status', 'Currency', 'Untaxed Amount', 'Total Amount',
+        ]
+
+    @api.model
+    def _get_ledger_query(self, project_ids, company_ids):
+        """Ledger rows of the projects: every linked quotation, PO, invoice and bill.
+
+        Each document branch is restricted to the ids the current user can
+        search on that model, so document record rules apply. Callers are
+        responsible for checking access to the projects.
+
+        :return: tuple (query, params)
+        """
+        def accessible(model_name, domain=()):
+            return self.env[model_name]._search([
+                ('project_csl_id', 'in', list(project_ids)),
+                ('company_id', 'in', list(company_ids)),
+                *domain,
+            ]).subselect()
+
+        query = SQL("""
+            SELECT project.project_reference,
+                   project.name,
+                   doc.doc_type,
+                   doc.name,
+                   partner.complete_name,
+                   doc.date,
+                   doc.state,
+                   currency.name,
+                   doc.amount_untaxed,
+                   doc.amount_total
+              FROM (
+                    SELECT so.project_csl_id AS project_id,
+                           'Quotation' AS doc_type,
+                           so.name,
+                           so.partner_id,
+                           so.date_order::date AS date,
+                           so.state,
+                           so.currency_id,
+                           so.amount_untaxed,
+                           so.amount_total
+                      FROM sale_order so
+                     WHERE so.id IN %s
+                 UNION ALL
+                    SELECT po.project_csl_id,
+                           'Purchase Order',
+                           po.name,
+                           po.partner_id,
+                           po.date_order::date,
+                           po.state,
+                           po.currency_id,
+                           po.amount_untaxed,
+                           po.amount_total
+                      FROM purchase_order po
+                     WHERE po.id IN %s
+                 UNION ALL
+                    SELECT move.project_csl_id,
+                           CASE move.move_type
+                                WHEN 'out_invoice' THEN 'Invoice'
+                                WHEN 'out_refund' THEN 'Credit Note'
+                                WHEN 'in_invoice' THEN 'Vendor Bill'
+                                ELSE 'Vendor Refund'
+                           END,
+                           move.name,
+                           move.partner_id,
+                           move.invoice_date,
+                           move.state,
+                           move.currency_id,
+                           move.amount_untaxed,
+                           move.amount_total
+                      FROM account_move move
+                     WHERE move.id IN %s
+                   ) doc
+              JOIN project_csl project ON project.id = doc.project_id
+         LEFT JOIN res_partner partner ON partner.id = doc.partner_id
+         LEFT JOIN res_currency currency ON currency.id = doc.currency_id
+          ORDER BY project.id, doc.doc_type, doc.date, doc.name
+        """,
+            accessible('sale.order'),
+            accessible('purchase.order'),
+            accessible('account.move', [('move_type', 'in', ('out_invoice', 'out_refund', 'in_invoice', 'in_refund'))]),
+        )
+        return query.code, query.params
+
+    # --- KPI ---
+
+    @api.model
+    def _bump_kpi_version(self):
+        """Advance the KPI version stamp once the current transaction commits.
+
+        The stamp is a PostgreSQL sequence: nextval() is cheap, never blocks
+        and is only called after commit, so a new stamp always sees the data
+        that caused it.
+        """
+        postcommit = self.env.cr.postcommit
+        if not postcommit.data.get('project.csl.kpi.version'):
+            postcommit.data['project.csl.kpi.version'] = True
+            postcommit.add(self._next_kpi_version)
+
+    def _next_kpi_version(self):
+        self.env.cr.execute("SELECT nextval('project_csl_kpi_version_seq')")
+
+    @api.model
+    def _get_kpi_version(self):
+        self.env.cr.execute("SELECT last_value FROM project_csl_kpi_version_seq")
+        return self.env.cr.fetchone()[0]
+
+    @api.model
+    def _can_read_kpi_amounts(self):
+        """Amounts come from the financial summary and the invoices, whose ACLs
+        are stricter than the project's."""
+        return (
+            self.env['project.csl.financial.summary'].check_access_rights('read', raise_exception=False)
+            and self.env['account.move'].check_access_rights('read', raise_exception=False)
+        )
+
+    @api.model
+    def _get_kpi_data(self, company_ids):
+        """Per project KPIs of the companies, from stored counters and aggregates.
+
+        Invoiced, billed and overdue amounts are only included for users who
+        may read the financial summary and invoices.
+        """
+        self.check_access_rights('read')
+        with_amounts = self._can_read_kpi_amounts()
+        amount_select = amount_join = ""
+        if with_amounts:
+            amount_select = """,
+                   COALESCE(summary.invoiced_amount, 0),
+                   COALESCE(summary.billed_amount, 0),
+                   COALESCE(overdue.amount, 0)"""
+            amount_join = """
+         LEFT JOIN (
+                    SELECT project_id,
+                           SUM(invoiced_amount) AS invoiced_amount,
+                           SUM(billed_amount) AS billed_amount
+                      FROM project_csl_financial_summary
+                  GROUP BY project_id
+                   ) summary ON summary.project_id = project.id
+         LEFT JOIN (
+                    SELECT project_csl_id AS project_id,
+                           SUM(amount_residual_signed) AS amount
+                      FROM account_move
+                     WHERE project_csl_id IS NOT NULL
+                       AND move_type = 'out_invoice'
+                       AND state = 'posted'
+                       AND payment_state IN ('not_paid', 'partial')
+                       AND invoice_date_due < %(today)s
+                  GROUP BY project_csl_id
+                   ) overdue ON overdue.project_id = project.id"""
+        self.env.cr.execute(f"""
+            SELECT project.id,
+                   project.project_reference,
+                   project.name,
+                   project.state,
+                   project.date_start,
+                   project.date_end,
+                   project.quotation_count,
+                   project.invoice_count,
+                   project.purchase_order_count,
+                   project.project_bill_count,
+                   project.employee_requisition_count{amount_select}
+              FROM project_csl project{amount_join}
+             WHERE project.company_id = ANY(%(company_ids)s)
+          ORDER BY project.id
+        """, {'today': fields.Date.context_today(self), 'company_ids': list(company_ids)})
+        keys = [
+            'id', 'project_reference', 'name', 'state', 'date_start', 'date_end',
+            'quotation_count', 'invoice_count', 'purchase_order_count',
+            'project_bill_count', 'employee_requisition_count',
+        ]
+        if with_amounts:
+            keys += ['invoiced_amount', 'billed_amount', 'overdue_amount']
+        return [dict(zip(keys, row)) for row in self.env.cr.fetchall()]
+
     # Buttons
     def action_confirm(self):
-        for rec in self:
-            rec.state = 'confirm'
+        self._set_state('confirm')
 
     def action_done(self):
-        for rec in self:
-            rec.state = 'done'
+        self._set_state('done')
 
     def action_draft(self):
-        for rec in self:
-            rec.state = 'draft'
+        self._set_state('draft')
+
+    def _set_state(self, state):
+        """Move the whole recordset to ``state`` with a single write.
+
+        Projects already in ``state`` are left alone. If any other project
+        cannot reach ``state`` from its current status, nothing is written.
+        The status change is logged in the chatter of every project with one
+        batched message creation instead of one tracking pass per record.
+        """
+        projects = self.filtered(lambda project: project.state != state)
+        if not projects:
+            return True
+        invalid = projects.filtered(lambda project: project.state not in STATE_TRANSITIONS[state])
+        if invalid:
+            state_labels = dict(self._fields['state']._description_selection(self.env))
+            raise UserError("These projects cannot be set to %s:\n%s" % (
+                state_labels[state],
+                "\n".join(f"- {project.display_name} ({state_labels[project.state]})" for project in invalid[:20])
+                + (f"\n... and {len(invalid) - 20} more" if len(invalid) > 20 else ""),
+            ))
+
+        old_states = {project.id: project.state for project in projects}
+        projects.with_context(mail_notrack=True).write({'state': state})
+        projects._log_state_changes(old_states)
+        return True
+
+    def _log_state_changes(self, old_states):
+        """Post the status tracking message of each project in one create."""
+        col_info = self.fields_get(['state'], attributes=['type', 'selection'])['state']
+        Tracking = self.env['mail.tracking.value']
+        subtype_id = self.env['ir.model.data']._xmlid_to_res_id('mail.mt_note')
+        self.env['mail.message'].sudo().create([{
+            'model': self._name,
+            'res_id': project.id,
+            'body': '',
+            'message_type': 'notification',
+            'subtype_id': subtype_id,
+            'author_id': self.env.user.partner_id.id,
+            'tracking_value_ids': [fields.Command.create(
+                Tracking._create_tracking_values(old_states[project.id], project.state, 'state', col_info, project)
+            )],
+        } for project in self])
 
 
 class SaleOrder(models.Model):
@@ -300,16 +1117,54 @@ class SaleOrder(models.Model):
         help="Linked Project",
         ondelete='set null',
         copy=False,
-        tracking=True
+        tracking=True,
+        index='btree_not_null'
     )
 
     project_reference = fields.Char(
         string="Project Reference",
-        related='project_csl_id.project_reference',
+        compute='_compute_project_reference',
         store=True,
-        readonly=True
+        readonly=True,
+        index='btree_not_null'
     )
 
+    @api.depends('project_csl_id')
+    def _compute_project_reference(self):
+        """Reference changes on the project are propagated by project.csl._sync_document_references."""
+        for order in self:
+            order.project_reference = order.project_csl_id.project_reference
+
+    def init(self):
+        super(SaleOrder, self).init()
+        # Origin resolution of invoices/bills looks up linked orders by name
+        tools.create_index(
+            self.env.cr, 'sale_order_name_project_csl_index',
+            self._table, ['name'],
+            where='project_csl_id IS NOT NULL',
+        )
+
+    @api.model_create_multi
+    def create(self, vals_list):
+        orders = super(SaleOrder, self).create(vals_list)
+        self.env['project.csl.financial.summary']._mark_projects_dirty(orders.project_csl_id.ids)
+        return orders
+
+    def write(self, vals):
+        old_project_ids = self.project_csl_id.ids
+        res = super(SaleOrder, self).write(vals)
+        self.env['project.csl.financial.summary']._mark_projects_dirty(
+            old_project_ids + self.project_csl_id.ids)
+        return res
+
+    def unlink(self):
+        self.env['project.csl.financial.summary']._mark_projects_dirty(self.project_csl_id.ids)
+        return super(SaleOrder, self).unlink()
+
+    def _job_attach_to_project_csl(self, project_id):
+        """Job entry point of the mass attach wizard."""
+        self.env['project.csl.attach.wizard']._attach_orders(self._name, self.ids, project_id)
+
     def _prepare_invoice(self):
         """Pass the project ID to the invoice when created from the SO."""
         invoice_vals = super(SaleOrder, self)._prepare_invoice()
@@ -0,0 +1,149 @@
+# -*- coding: utf-8 -*-
+import heapq
+from datetime import date
+
+from odoo import models, fields, api, tools
+
+
+class ProjectCslEmployeeAllocation(models.Model):
+    """Weekly allocation of employees to projects, as one SQL view.
+
+    Each row is one employee on one project during one week, between the
+    project start and end dates. A project without an end date is counted
+    until 90 days after today or after its start, whichever is later. Rows
+    of an employee working on several open projects in the same week are
+    flagged as double-booked; like the conflict engine, projects that are
+    done are ignored.
+    """
+    _name = 'project.csl.employee.allocation'
+    _description = 'Project Employee Allocation'
+    _auto = False
+    _rec_name = 'employee_id'
+    _order = 'week_start, employee_id, project_id'
+
+    employee_id = fields.Many2one('hr.employee', string='Employee', readonly=True)
+    project_id = fields.Many2one('project.csl', string='Project', readonly=True)
+    company_id = fields.Many2one('res.company', string='Company', readonly=True)
+    project_state = fields.Selection([
+        ('draft', 'Draft'),
+        ('confirm', 'Confirmed'),
+        ('done', 'Done'),
+    ], string='Project Status', readonly=True)
+    week_start = fields.Date(string='Week', readonly=True)
+    allocation = fields.Integer(string='Projects', readonly=True)
+    is_double_booked = fields.Boolean(string='Double-booked', readonly=True)
+
+    def init(self):
+        tools.drop_view_if_exists(self.env.cr, self._table)
+        self.env.cr.execute("""
+            CREATE OR REPLACE VIEW project_csl_employee_allocation AS (
+                SELECT row_number() OVER (ORDER BY week.week_start, rel.employee_id, project.id) AS id,
+                       rel.employee_id,
+                       project.id AS project_id,
+                       project.company_id,
+                       project.state AS project_state,
+                       week.week_start::date AS week_start,
+                       1 AS allocation,
+                       project.state != 'done'
+                           AND COUNT(*) FILTER (WHERE project.state != 'done')
+                               OVER (PARTITION BY rel.employee_id, week.week_start) > 1 AS is_double_booked
+                  FROM project_csl_employee_rel rel
+                  JOIN project_csl project ON project.id = rel.project_id
+                  CROSS JOIN LATERAL generate_series(
+                        date_trunc('week', project.date_start),
+                        date_trunc('week', COALESCE(project.date_end, GREATEST(project.date_start, CURRENT_DATE) + 90)),
+                        interval '1 week'
+                  ) AS week(week_start)
+                 WHERE project.date_start IS NOT NULL
+            )
+        """)
+
+    # --- Conflict Detection ---
+
+    @api.model
+    def _load_assignments(self, date_from, date_to, employee_ids=None, exclude_project_ids=()):
+        """Employee assignments overlapping [date_from, date_to], clipped to it.
+
+        :return: list of (employee_id, start, end, project_id) tuples
+        """
+        self.env.cr.execute("""
+            SELECT rel.employee_id,
+                   GREATEST(project.date_start, %(date_from)s),
+                   LEAST(COALESCE(project.date_end, %(date_to)s), %(date_to)s),
+                   project.id
+              FROM project_csl_employee_rel rel
+              JOIN project_csl project ON project.id = rel.project_id
+             WHERE project.date_start <= %(date_to)s
+               AND (project.date_end IS NULL OR project.date_end >= %(date_from)s)
+               AND project.state != 'done'
+               AND (%(all_employees)s OR rel.employee_id = ANY(%(employee_ids)s))
+               AND project.id != ALL(%(exclude_project_ids)s)
+        """, {
+            'date_from': date_from,
+            'date_to': date_to,
+            'all_employees': employee_ids is None,
+            'employee_ids': list(employee_ids or []),
+            'exclude_project_ids': list(exclude_project_ids),
+        })
+        return self.env.cr.fetchall()
+
+    @api.model
+    def _sweep_conflicts(self, assignments):
+        """Find overlapping assignments of each employee.
+
+        Assignments are sorted by employee and start date, then swept while a
+        heap keeps the assignments still running, ordered by end date. Each
+        assignment is only compared with the ones it actually overlaps, so the
+        cost is O(n log n + conflicts) instead of pairwise.
+
+        :param assignments: iterable of (employee_id, start, end, project_id)
+        :return: list of dicts with employee_id, project_id, other_project_id,
+                 date_from and date_to of the overlap
+        """
+        conflicts = []
+        running = []
+        current_employee_id = None
+        for employee_id, start, end, project_id in sorted(assignments):
+            if employee_id != current_employee_id:
+                current_employee_id = employee_id
+                running = []
+            while running and running[0][0] < start:
+                heapq.heappop(running)
+            for other_end, other_project_id in running:
+                conflicts.append({
+                    'employee_id': employee_id,
+                    'project_id': other_project_id,
+                    'other_project_id': project_id,
+                    'date_from': start,
+                    'date_to': min(end, other_end),
+                })
+            heapq.heappush(running, (end, project_id))
+        return conflicts
+
+    @api.model
+    def _find_conflicts(self, date_from, date_to, employee_ids=None, extra_assignments=(), exclude_project_ids=()):
+        """Double bookings of employees within a date window.
+
+        Projects that are done are ignored. ``extra_assignments`` lets a
+        caller check assignments that are not saved yet, in which case the
+        saved version of their project should be listed in
+        ``exclude_project_ids``.
+        """
+        assignments = self._load_assignments(date_from, date_to, employee_ids, exclude_project_ids)
+        return self._sweep_conflicts(assignments + list(extra_assignments))
+
+    @api.model
+    def _get_project_conflicts(self, project):
+        """Conflicts between the (possibly unsaved) values of a project and the other projects."""
+        if not project.employee_ids or not project.date_start or project.state == 'done':
+            return []
+        date_to = project.date_end or date.max
+        if date_to < project.date_start:
+            return []
+        # 0 stands for the edited project, which may not have an id yet
+        own_assignments = [(employee_id, project.date_start, date_to, 0) for employee_id in project.employee_ids.ids]
+        conflicts = self._find_conflicts(
+            project.date_start, date_to, project.employee_ids.ids,
+            extra_assignments=own_assignments, exclude_project_ids=project._origin.ids,
+        )
+        return [conflict for conflict in conflicts if 0 in (conflict['project_id'], conflict['other_project_id'])]
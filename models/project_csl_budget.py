@@ -0,0 +1,236 @@
+# -*- coding: utf-8 -*-
+from odoo import models, fields, api, tools
+
+class ProjectCslBudgetCategory(models.Model):
+    _name = 'project.csl.budget.category'
+    _description = 'Project Budget Category'
+    _order = 'sequence, id'
+
+    name = fields.Char(string='Category', required=True, translate=True)
+    sequence = fields.Integer(string='Sequence', default=10)
+    active = fields.Boolean(default=True)
+    category_type = fields.Selection([
+        ('cost', 'Cost'),
+        ('revenue', 'Revenue'),
+    ], string='Type', required=True, default='cost')
+    product_categ_ids = fields.Many2many(
+        'product.category',
+        'project_csl_budget_category_product_category_rel',
+        'category_id',
+        'product_category_id',
+        string='Product Categories',
+        help="Bill, invoice and purchase lines whose product is in one of these categories "
+             "(or their children) count as actuals of this category. A category without "
+             "product categories collects the lines of its type that no other category matches."
+    )
+
+class ProjectCslBudgetLine(models.Model):
+    _name = 'project.csl.budget.line'
+    _description = 'Project Budget Line'
+    _order = 'project_id, sequence, id'
+
+    project_id = fields.Many2one('project.csl', string='Project', required=True, ondelete='cascade', index=True)
+    sequence = fields.Integer(string='Sequence', default=10)
+    category_id = fields.Many2one('project.csl.budget.category', string='Category', required=True, ondelete='restrict')
+    category_type = fields.Selection(related='category_id.category_type')
+    company_id = fields.Many2one(related='project_id.company_id', store=True)
+    currency_id = fields.Many2one(related='company_id.currency_id', string='Currency', store=True)
+    planned_amount = fields.Monetary(string='Planned')
+    actual_amount = fields.Monetary(string='Actual', compute='_compute_actuals')
+    committed_amount = fields.Monetary(string='Committed', compute='_compute_actuals',
+                                       help="Confirmed purchase orders of the category.")
+    variance_amount = fields.Monetary(string='Variance', compute='_compute_actuals')
+
+    _sql_constraints = [
+        ('project_category_uniq', 'unique(project_id, category_id)',
+         "A category can only be budgeted once per project."),
+    ]
+
+    @api.depends('project_id', 'category_id', 'planned_amount')
+    def _compute_actuals(self):
+        groups = self.env['project.csl.budget.actual']._read_group(
+            [('project_id', 'in', self.project_id._origin.ids)],
+            groupby=['project_id', 'category_id'],
+            aggregates=['actual_amount:sum', 'committed_amount:sum'],
+        )
+        actuals = {
+            (project.id, category.id): (actual, committed)
+            for project, category, actual, committed in groups
+        }
+        for line in self:
+            actual, committed = actuals.get((line.project_id._origin.id, line.category_id.id), (0.0, 0.0))
+            line.actual_amount = actual
+            line.committed_amount = committed
+            line.variance_amount = line.planned_amount - actual
+
+class ProjectCslBudgetActual(models.Model):
+    """Actual and committed amounts per project and budget category, maintained in SQL.
+
+    Refreshed together with project.csl.financial.summary: per project when
+    its documents change, and fully by a scheduled action.
+    """
+    _name = 'project.csl.budget.actual'
+    _description = 'Project Budget Actuals'
+    _auto = False
+    _rec_name = 'project_id'
+
+    project_id = fields.Many2one('project.csl', string='Project', readonly=True)
+    company_id = fields.Many2one('res.company', string='Company', readonly=True)
+    category_id = fields.Many2one('project.csl.budget.category', string='Category', readonly=True)
+    currency_id = fields.Many2one(related='company_id.currency_id')
+    actual_amount = fields.Monetary(string='Actual', readonly=True)
+    committed_amount = fields.Monetary(string='Committed', readonly=True)
+
+    def init(self):
+        self.env.cr.execute("""
+            CREATE TABLE IF NOT EXISTS project_csl_budget_actual (
+                id SERIAL PRIMARY KEY,
+                project_id INTEGER NOT NULL REFERENCES project_csl(id) ON DELETE CASCADE,
+                company_id INTEGER REFERENCES res_company(id) ON DELETE CASCADE,
+                category_id INTEGER NOT NULL REFERENCES project_csl_budget_category(id) ON DELETE CASCADE,
+                actual_amount NUMERIC NOT NULL DEFAULT 0,
+                committed_amount NUMERIC NOT NULL DEFAULT 0
+            )
+        """)
+        self.env.cr.execute("""
+            CREATE UNIQUE INDEX IF NOT EXISTS project_csl_budget_actual_project_company_category_uniq
+            ON project_csl_budget_actual (project_id, company_id, category_id)
+        """)
+
+    def _get_category_join(self, category_type):
+        """Lateral join resolving the budget category of a line.
+
+        The most specific product category mapping wins, categories without
+        mapping catch whatever is left.
+        """
+        return f"""
+            LEFT JOIN product_product product ON product.id = line.product_id
+            LEFT JOIN product_template template ON template.id = product.product_tmpl_id
+            LEFT JOIN product_category categ ON categ.id = template.categ_id
+            LEFT JOIN LATERAL (
+                SELECT cat.id AS category_id
+                  FROM project_csl_budget_category cat
+             LEFT JOIN project_csl_budget_category_product_category_rel rel ON rel.category_id = cat.id
+             LEFT JOIN product_category mapped ON mapped.id = rel.product_category_id
+                 WHERE cat.active
+                   AND cat.category_type = {category_type}
+                   AND (rel.category_id IS NULL OR categ.parent_path LIKE mapped.parent_path || '%%')
+              ORDER BY rel.category_id IS NULL, length(mapped.parent_path) DESC, cat.sequence, cat.id
+                 LIMIT 1
+            ) budget ON TRUE
+        """
+
+    def _insert_actual_rows(self, project_filter, params):
+        self.env.cr.execute(f"""
+            INSERT INTO project_csl_budget_actual (project_id, company_id, category_id, actual_amount, committed_amount)
+            SELECT src.project_id, src.company_id, src.category_id, SUM(src.actual_amount), SUM(src.committed_amount)
+              FROM (
+                    SELECT move.project_csl_id AS project_id,
+                           move.company_id,
+                           budget.category_id,
+                           CASE WHEN move.move_type IN ('in_invoice', 'in_refund')
+                                THEN line.balance ELSE -line.balance END AS actual_amount,
+                           0 AS committed_amount
+                      FROM account_move_line line
+                      JOIN account_move move ON move.id = line.move_id
+                      {self._get_category_join(
+                          "CASE WHEN move.move_type IN ('in_invoice', 'in_refund') THEN 'cost' ELSE 'revenue' END")}
+                     WHERE move.state = 'posted'
+                       AND move.move_type IN ('out_invoice', 'out_refund', 'in_invoice', 'in_refund')
+                       AND line.display_type = 'product'
+                       AND {project_filter % 'move.project_csl_id'}
+                 UNION ALL
+                    SELECT po.project_csl_id,
+                           po.company_id,
+                           budget.category_id,
+                           0,
+                           line.price_subtotal / COALESCE(NULLIF(po.currency_rate, 0), 1)
+                      FROM purchase_order_line line
+                      JOIN purchase_order po ON po.id = line.order_id
+                      {self._get_category_join("'cost'")}
+                     WHERE po.state IN ('purchase', 'done')
+                       AND line.display_type IS NULL
+                       AND {project_filter % 'po.project_csl_id'}
+                   ) src
+             WHERE src.category_id IS NOT NULL
+          GROUP BY src.project_id, src.company_id, src.category_id
+        """, params)
+
+    @api.model
+    def _refresh_projects(self, project_ids):
+        """Rebuild the actuals of the given projects only."""
+        if not project_ids:
+            return
+        self.env.flush_all()
+        params = {'project_ids': tuple(project_ids)}
+        self.env.cr.execute(
+            "DELETE FROM project_csl_budget_actual WHERE project_id IN %(project_ids)s", params)
+        self._insert_actual_rows('%s IN %%(project_ids)s', params)
+        self.invalidate_model()
+
+    @api.model
+    def _refresh_all(self):
+        """Rebuild all actuals (scheduled action)."""
+        self.env.flush_all()
+        # DELETE rather than TRUNCATE: no ACCESS EXCLUSIVE lock, concurrent readers keep their snapshot
+        self.env.cr.execute("DELETE FROM project_csl_budget_actual")
+        self._insert_actual_rows('%s IS NOT NULL', {})
+        self.invalidate_model()
+
+class ProjectCslBudgetVariance(models.Model):
+    """Budget vs. actual per project and category, as one SQL view."""
+    _name = 'project.csl.budget.variance'
+    _description = 'Project Budget Variance'
+    _auto = False
+    _rec_name = 'project_id'
+    _order = 'project_id, category_id'
+
+    project_id = fields.Many2one('project.csl', string='Project', readonly=True)
+    category_id = fields.Many2one('project.csl.budget.category', string='Category', readonly=True)
+    category_type = fields.Selection([
+        ('cost', 'Cost'),
+        ('revenue', 'Revenue'),
+    ], string='Type', readonly=True)
+    company_id = fields.Many2one('res.company', string='Company', readonly=True)
+    currency_id = fields.Many2one('res.currency', string='Currency', readonly=True)
+    planned_amount = fields.Monetary(string='Planned', readonly=True)
+    actual_amount = fields.Monetary(string='Actual', readonly=True)
+    committed_amount = fields.Monetary(string='Committed', readonly=True)
+    variance_amount = fields.Monetary(string='Variance', readonly=True)
+
+    def init(self):
+        tools.drop_view_if_exists(self.env.cr, self._table)
+        self.env.cr.execute("""
+            CREATE OR REPLACE VIEW project_csl_budget_variance AS (
+                SELECT row_number() OVER (ORDER BY keys.project_id, keys.category_id) AS id,
+                       keys.project_id,
+                       keys.category_id,
+                       cat.category_type,
+                       project.company_id,
+                       company.currency_id,
+                       COALESCE(planned.amount, 0) AS planned_amount,
+                       COALESCE(actual.actual_amount, 0) AS actual_amount,
+                       COALESCE(actual.committed_amount, 0) AS committed_amount,
+                       COALESCE(planned.amount, 0) - COALESCE(actual.actual_amount, 0) AS variance_amount
+                  FROM (
+                        SELECT project_id, category_id FROM project_csl_budget_line
+                         UNION
+                        SELECT project_id, category_id FROM project_csl_budget_actual
+                       ) keys
+                  JOIN project_csl project ON project.id = keys.project_id
+                  JOIN res_company company ON company.id = project.company_id
+                  JOIN project_csl_budget_category cat ON cat.id = keys.category_id
+             LEFT JOIN (
+                        SELECT project_id, category_id, SUM(planned_amount) AS amount
+                          FROM project_csl_budget_line
+                      GROUP BY project_id, category_id
+                       ) planned ON planned.project_id = keys.project_id AND planned.category_id = keys.category_id
+             LEFT JOIN (
+                        SELECT project_id, category_id,
+                               SUM(actual_amount) AS actual_amount,
+                               SUM(committed_amount) AS committed_amount
+                          FROM project_csl_budget_actual
+                      GROUP BY project_id, category_id
+                       ) actual ON actual.project_id = keys.project_id AND actual.category_id = keys.category_id
+            )
+        """)
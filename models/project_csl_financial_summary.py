@@ -0,0 +1,195 @@
+# -*- coding: utf-8 -*-
+from odoo import models, fields, api
+
+# Key under which dirty project ids are collected until the transaction commits
+DIRTY_PROJECTS_KEY = 'project.csl.financial.summary.dirty'
+
+# Scheduled action refreshing the queued projects
+DIRTY_PROJECTS_CRON_XMLID = 'concept_project_management.ir_cron_project_csl_financial_summary_dirty'
+
+class ProjectCslFinancialSummary(models.Model):
+    """Per project and company financial figures, maintained in SQL.
+
+    The table is filled by a single aggregate query over the linked sale
+    orders, purchase orders, invoices and vendor bills. Projects whose
+    documents change are queued when the transaction commits and their rows
+    are rebuilt by a scheduled action, so concurrent transactions never
+    rewrite the same rows. Another scheduled action rebuilds the whole table.
+    """
+    _name = 'project.csl.financial.summary'
+    _description = 'Project Financial Summary'
+    _auto = False
+    _rec_name = 'project_id'
+    _order = 'project_id, company_id'
+
+    project_id = fields.Many2one('project.csl', string='Project', readonly=True)
+    project_reference = fields.Char(related='project_id.project_reference', string='Project Reference')
+    company_id = fields.Many2one('res.company', string='Company', readonly=True)
+    currency_id = fields.Many2one('res.currency', string='Currency', readonly=True)
+    quoted_amount = fields.Monetary(string='Quoted', readonly=True)
+    ordered_amount = fields.Monetary(string='Ordered', readonly=True)
+    invoiced_amount = fields.Monetary(string='Invoiced', readonly=True)
+    billed_amount = fields.Monetary(string='Billed', readonly=True)
+    paid_amount = fields.Monetary(string='Paid', readonly=True)
+    margin_amount = fields.Monetary(string='Margin', readonly=True)
+
+    def init(self):
+        self.env.cr.execute("""
+            CREATE TABLE IF NOT EXISTS project_csl_financial_summary (
+                id SERIAL PRIMARY KEY,
+                project_id INTEGER NOT NULL REFERENCES project_csl(id) ON DELETE CASCADE,
+                company_id INTEGER REFERENCES res_company(id) ON DELETE CASCADE,
+                currency_id INTEGER REFERENCES res_currency(id),
+                quoted_amount NUMERIC NOT NULL DEFAULT 0,
+                ordered_amount NUMERIC NOT NULL DEFAULT 0,
+                invoiced_amount NUMERIC NOT NULL DEFAULT 0,
+                billed_amount NUMERIC NOT NULL DEFAULT 0,
+                paid_amount NUMERIC NOT NULL DEFAULT 0,
+                margin_amount NUMERIC NOT NULL DEFAULT 0
+            )
+        """)
+        self.env.cr.execute("""
+            CREATE UNIQUE INDEX IF NOT EXISTS project_csl_financial_summary_project_company_uniq
+            ON project_csl_financial_summary (project_id, company_id)
+        """)
+        # Append-only queue: no unique key, so concurrent inserts never conflict
+        self.env.cr.execute("""
+            CREATE TABLE IF NOT EXISTS project_csl_financial_summary_dirty (
+                project_id INTEGER NOT NULL REFERENCES project_csl(id) ON DELETE CASCADE
+            )
+        """)
+
+    def _get_summary_query(self, project_filter):
+        """Aggregate query over every document linked to a project.
+
+        Sales and purchase amounts are converted to company currency with the
+        rate stored on the order, move amounts use their signed company
+        currency columns. Each project also contributes an empty row so it
+        shows up before any document is linked.
+        """
+        return f"""
+            SELECT doc.project_id,
+                   doc.company_id,
+                   company.currency_id,
+                   SUM(doc.quoted_amount),
+                   SUM(doc.ordered_amount),
+                   SUM(doc.invoiced_amount),
+                   SUM(doc.billed_amount),
+                   SUM(doc.paid_amount),
+                   SUM(doc.invoiced_amount) - SUM(doc.billed_amount)
+              FROM (
+                    SELECT project.id AS project_id,
+                           project.company_id,
+                           0 AS quoted_amount,
+                           0 AS ordered_amount,
+                           0 AS invoiced_amount,
+                           0 AS billed_amount,
+                           0 AS paid_amount
+                      FROM project_csl project
+                     WHERE {project_filter % 'project.id'}
+                 UNION ALL
+                    SELECT so.project_csl_id,
+                           so.company_id,
+                           so.amount_untaxed / COALESCE(NULLIF(so.currency_rate, 0), 1),
+                           0, 0, 0, 0
+                      FROM sale_order so
+                     WHERE so.state != 'cancel'
+                       AND {project_filter % 'so.project_csl_id'}
+                 UNION ALL
+                    SELECT po.project_csl_id,
+                           po.company_id,
+                           0,
+                           po.amount_untaxed / COALESCE(NULLIF(po.currency_rate, 0), 1),
+                           0, 0, 0
+                      FROM purchase_order po
+                     WHERE po.state IN ('purchase', 'done')
+                       AND {project_filter % 'po.project_csl_id'}
+                 UNION ALL
+                    SELECT move.project_csl_id,
+                           move.company_id,
+                           0, 0,
+                           CASE WHEN move.move_type IN ('out_invoice', 'out_refund')
+                                THEN move.amount_untaxed_signed ELSE 0 END,
+                           CASE WHEN move.move_type IN ('in_invoice', 'in_refund')
+                                THEN -move.amount_untaxed_signed ELSE 0 END,
+                           CASE WHEN move.move_type IN ('out_invoice', 'out_refund')
+                                THEN move.amount_total_signed - move.amount_residual_signed ELSE 0 END
+                      FROM account_move move
+                     WHERE move.state = 'posted'
+                       AND move.move_type IN ('out_invoice', 'out_refund', 'in_invoice', 'in_refund')
+                       AND {project_filter % 'move.project_csl_id'}
+                   ) doc
+              JOIN res_company company ON company.id = doc.company_id
+          GROUP BY doc.project_id, doc.company_id, company.currency_id
+        """
+
+    def _insert_summary_rows(self, project_filter, params):
+        self.env.cr.execute(f"""
+            INSERT INTO project_csl_financial_summary (
+                project_id, company_id, currency_id,
+                quoted_amount, ordered_amount, invoiced_amount,
+                billed_amount, paid_amount, margin_amount
+            )
+            {self._get_summary_query(project_filter)}
+        """, params)
+
+    @api.model
+    def _refresh_projects(self, project_ids):
+        """Rebuild the summary rows of the given projects only."""
+        if not project_ids:
+            return
+        self.env.flush_all()
+        params = {'project_ids': tuple(project_ids)}
+        self.env.cr.execute(
+            "DELETE FROM project_csl_financial_summary WHERE project_id IN %(project_ids)s", params)
+        self._insert_summary_rows('%s IN %%(project_ids)s', params)
+        self.invalidate_model()
+
+    @api.model
+    def _refresh_all(self):
+        """Rebuild the whole summary table (scheduled action)."""
+        self.env.flush_all()
+        # DELETE rather than TRUNCATE: no ACCESS EXCLUSIVE lock, concurrent readers keep their snapshot
+        self.env.cr.execute("DELETE FROM project_csl_financial_summary")
+        self._insert_summary_rows('%s IS NOT NULL', {})
+        self.invalidate_model()
+        self.env['project.csl']._bump_kpi_version()
+
+    @api.model
+    def _mark_projects_dirty(self, project_ids):
+        """Queue projects whose documents changed for a refresh after commit."""
+        project_ids = {project_id for project_id in project_ids if isinstance(project_id, int)}
+        if not project_ids:
+            return
+        precommit = self.env.cr.precommit
+        dirty_ids = precommit.data.setdefault(DIRTY_PROJECTS_KEY, set())
+        if not dirty_ids:
+            precommit.add(self._queue_dirty_projects)
+            cron = self.env.ref(DIRTY_PROJECTS_CRON_XMLID, raise_if_not_found=False)
+            if cron:
+                cron.sudo()._trigger()
+        dirty_ids.update(project_ids)
+        self.env['project.csl']._bump_kpi_version()
+
+    def _queue_dirty_projects(self):
+        dirty_ids = self.env.cr.precommit.data.pop(DIRTY_PROJECTS_KEY, set())
+        if dirty_ids:
+            self.env.cr.execute(
+                "INSERT INTO project_csl_financial_summary_dirty (project_id) SELECT unnest(%s)",
+                (list(dirty_ids),),
+            )
+
+    @api.model
+    def _cron_refresh_dirty_projects(self):
+        """Rebuild the summary rows and budget actuals of the queued projects.
+
+        Only queue rows visible to this transaction are consumed, projects
+        queued meanwhile are left for the next run.
+        """
+        self.env.cr.execute("DELETE FROM project_csl_financial_summary_dirty RETURNING project_id")
+        dirty_ids = list({row[0] for row in self.env.cr.fetchall()})
+        if not dirty_ids:
+            return
+        self._refresh_projects(dirty_ids)
+        self.env['project.csl.budget.actual']._refresh_projects(dirty_ids)
+        self.env['project.csl']._bump_kpi_version()
@@ -0,0 +1,192 @@
+# -*- coding: utf-8 -*-
+import logging
+import time
+import traceback
+import uuid
+from datetime import timedelta
+
+from odoo import models, fields, api
+from odoo.tools import split_every
+
+_logger = logging.getLogger(__name__)
+
+# Worker crons running jobs in parallel, at most job_concurrency of them are used
+JOB_WORKER_CRON_XMLIDS = [
+    'concept_project_management.ir_cron_project_csl_job',
+    'concept_project_management.ir_cron_project_csl_job_worker_2',
+    'concept_project_management.ir_cron_project_csl_job_worker_3',
+    'concept_project_management.ir_cron_project_csl_job_worker_4',
+]
+
+class ProjectCslJob(models.Model):
+    """Chunk of deferred work on a recordset, executed by a cron worker.
+
+    A job calls ``method_name`` on the records ``record_ids`` of
+    ``model_name`` as the user who enqueued it. Every job is committed on
+    its own, failed jobs are retried with a growing delay until
+    ``max_attempts`` is reached.
+    """
+    _name = 'project.csl.job'
+    _description = 'Project Background Job'
+    _order = 'priority, id'
+
+    name = fields.Char(string='Description', required=True)
+    project_id = fields.Many2one('project.csl', string='Project', ondelete='cascade', index=True)
+    batch_ref = fields.Char(string='Batch', index=True, readonly=True)
+    user_id = fields.Many2one('res.users', string='User', required=True, default=lambda self: self.env.user)
+    company_id = fields.Many2one('res.company', string='Company', required=True, default=lambda self: self.env.company)
+    model_name = fields.Char(string='Model', required=True)
+    method_name = fields.Char(string='Method', required=True)
+    record_ids = fields.Json(string='Record IDs')
+    record_count = fields.Integer(string='Records')
+    kwargs = fields.Json(string='Arguments')
+    state = fields.Selection([
+        ('pending', 'Pending'),
+        ('running', 'Running'),
+        ('done', 'Done'),
+        ('failed', 'Failed'),
+    ], string='Status', default='pending', required=True, index=True)
+    priority = fields.Integer(string='Priority', default=10)
+    attempts = fields.Integer(string='Attempts', readonly=True)
+    max_attempts = fields.Integer(string='Max Attempts', default=3)
+    date_planned = fields.Datetime(string='Planned Date', default=fields.Datetime.now)
+    date_started = fields.Datetime(string='Started On', readonly=True)
+    date_done = fields.Datetime(string='Done On', readonly=True)
+    exc_info = fields.Text(string='Error', readonly=True)
+
+    # --- Enqueue ---
+
+    @api.model
+    def _enqueue(self, records, method_name, name=None, chunk_size=100, project=None, kwargs=None, priority=10):
+        """Split `records` in chunks and queue one job per chunk.
+
+        :return: the created jobs (sudo)
+        """
+        if not records:
+            return self.sudo()
+        batch_ref = uuid.uuid4().hex
+        vals_list = []
+        for chunk_ids in split_every(chunk_size, records.ids, list):
+            vals_list.append({
+                'name': name or f"{records._description}: {method_name}",
+                'project_id': project.id if project else False,
+                'batch_ref': batch_ref,
+                'user_id': self.env.user.id,
+                'company_id': self.env.company.id,
+                'model_name': records._name,
+                'method_name': method_name,
+                'record_ids': chunk_ids,
+                'record_count': len(chunk_ids),
+                'kwargs': kwargs or {},
+                'priority': priority,
+            })
+        jobs = self.sudo().create(vals_list)
+        self._trigger_workers()
+        return jobs
+
+    # --- Worker ---
+
+    @api.model
+    def _get_concurrency_limit(self):
+        """Number of jobs allowed to run at once, capped by the worker crons."""
+        limit = int(self.env['ir.config_parameter'].sudo().get_param(
+            'concept_project_management.job_concurrency', 2))
+        return max(1, min(limit, len(JOB_WORKER_CRON_XMLIDS)))
+
+    @api.model
+    def _trigger_workers(self):
+        """Wake up as many worker crons as jobs may run concurrently.
+
+        Each cron runs in its own worker and claims jobs with SKIP LOCKED,
+        so they never pick the same job.
+        """
+        for xmlid in JOB_WORKER_CRON_XMLIDS[:self._get_concurrency_limit()]:
+            cron = self.env.ref(xmlid, raise_if_not_found=False)
+            if cron:
+                cron.sudo()._trigger()
+
+    @api.model
+    def _requeue_stale_jobs(self, timeout_minutes=60):
+        """Put back jobs left running by a worker that died.
+
+        A job that already used all its attempts is marked failed, so a job
+        that keeps killing its worker is not retried forever.
+        """
+        stale_jobs = self.search([
+            ('state', '=', 'running'),
+            ('date_started', '<', fields.Datetime.now() - timedelta(minutes=timeout_minutes)),
+        ])
+        exhausted = stale_jobs.filtered(lambda job: job.attempts >= job.max_attempts)
+        exhausted.write({'state': 'failed', 'exc_info': "The worker running this job stopped responding."})
+        (stale_jobs - exhausted).write({'state': 'pending'})
+
+    @api.model
+    def _claim_next_job(self):
+        """Lock and return the next runnable job, or an empty recordset."""
+        self.env.flush_all()
+        # Serialize claims between workers so the running count stays exact
+        self.env.cr.execute("SELECT pg_advisory_xact_lock(hashtext('project_csl_job_claim'))")
+        self.env.cr.execute("SELECT COUNT(*) FROM project_csl_job WHERE state = 'running'")
+        if self.env.cr.fetchone()[0] >= self._get_concurrency_limit():
+            return self.browse()
+        self.env.cr.execute("""
+            SELECT id
+              FROM project_csl_job
+             WHERE state = 'pending'
+               AND (date_planned IS NULL OR date_planned <= (now() at time zone 'UTC'))
+          ORDER BY priority, id
+             LIMIT 1
+               FOR UPDATE SKIP LOCKED
+        """)
+        row = self.env.cr.fetchone()
+        if not row:
+            return self.browse()
+        job = self.browse(row[0])
+        job.write({
+            'state': 'running',
+            'date_started': fields.Datetime.now(),
+            'attempts': job.attempts + 1,
+        })
+        self.env.cr.commit()
+        return job
+
+    def _run(self):
+        self.ensure_one()
+        try:
+            records = self.env[self.model_name].with_user(self.user_id).with_company(self.company_id)
+            getattr(records.browse(self.record_ids or []), self.method_name)(**(self.kwargs or {}))
+            self.write({'state': 'done', 'date_done': fields.Datetime.now(), 'exc_info': False})
+            self.env.cr.commit()
+        except Exception:
+            self.env.cr.rollback()
+            _logger.exception("Project job %s failed (attempt %s)", self.id, self.attempts)
+            failed = self.attempts >= self.max_attempts
+            self.write({
+                'state': 'failed' if failed else 'pending',
+                'date_planned': fields.Datetime.now() + timedelta(minutes=5 * self.attempts),
+                'exc_info': traceback.format_exc(),
+            })
+            self.env.cr.commit()
+
+    @api.model
+    def _cron_process_jobs(self, time_limit=240):
+        """Run pending jobs one by one until none is left or time is up."""
+        self._requeue_stale_jobs()
+        start = time.monotonic()
+        while time.monotonic() - start < time_limit:
+            job = self._claim_next_job()
+            if not job:
+                return
+            job._run()
+        # Out of time, come back for the remaining jobs
+        self._trigger_workers()
+
+    # --- Actions ---
+
+    def action_retry(self):
+        self.filtered(lambda job: job.state == 'failed').write({
+            'state': 'pending',
+            'attempts': 0,
+            'date_planned': fields.Datetime.now(),
+        })
+        self._trigger_workers()
@@ -0,0 +1,86 @@
+# -*- coding: utf-8 -*-
+import functools
+import threading
+import time
+
+from odoo import models, fields, api
+
+# System parameter holding the slow operation threshold in milliseconds (0 or unset: disabled)
+PERF_THRESHOLD_PARAM = 'concept_project_management.perf_log_threshold_ms'
+
+
+def instrumented(method):
+    """Measure a model method and log it to project.csl.perf.log when it is slow.
+
+    When no threshold is configured the wrapper only reads one cached system
+    parameter before calling the method.
+    """
+    @functools.wraps(method)
+    def wrapper(self, *args, **kwargs):
+        threshold = self.env['project.csl.perf.log']._get_threshold()
+        if not threshold:
+            return method(self, *args, **kwargs)
+
+        thread = threading.current_thread()
+        query_count = self.env.cr.sql_log_count
+        query_time = getattr(thread, 'query_time', None)
+        start = time.perf_counter()
+
+        result = method(self, *args, **kwargs)
+
+        duration = (time.perf_counter() - start) * 1000
+        if duration >= threshold:
+            sql_time = None
+            if query_time is not None:
+                sql_time = (getattr(thread, 'query_time', query_time) - query_time) * 1000
+            record_count = len(self)
+            if not record_count and isinstance(result, models.BaseModel):
+                record_count = len(result)
+            self.env['project.csl.perf.log']._log_operation(
+                self._name, method.__name__, record_count,
+                self.env.cr.sql_log_count - query_count, duration, sql_time,
+            )
+        return result
+    return wrapper
+
+
+class ProjectCslPerfLog(models.Model):
+    _name = 'project.csl.perf.log'
+    _description = 'Project Slow Operation Log'
+    _order = 'id desc'
+    _rec_name = 'operation'
+
+    operation = fields.Char(string='Operation', required=True, readonly=True)
+    model_name = fields.Char(string='Model', readonly=True)
+    method_name = fields.Char(string='Method', readonly=True)
+    user_id = fields.Many2one('res.users', string='User', readonly=True)
+    company_id = fields.Many2one('res.company', string='Company', readonly=True)
+    record_count = fields.Integer(string='Records', readonly=True, group_operator='sum')
+    query_count = fields.Integer(string='Queries', readonly=True, group_operator='sum')
+    duration = fields.Float(string='Duration (ms)', readonly=True, group_operator='sum')
+    sql_time = fields.Float(string='SQL Time (ms)', readonly=True, group_operator='sum')
+    python_time = fields.Float(string='Python Time (ms)', readonly=True, group_operator='sum')
+
+    @api.model
+    def _get_threshold(self):
+        return float(self.env['ir.config_parameter'].sudo().get_param(PERF_THRESHOLD_PARAM) or 0)
+
+    @api.model
+    def _log_operation(self, model_name, method_name, record_count, query_count, duration, sql_time):
+        self.sudo().create({
+            'operation': f"{model_name}.{method_name}",
+            'model_name': model_name,
+            'method_name': method_name,
+            'user_id': self.env.uid,
+            'company_id': self.env.company.id,
+            'record_count': record_count,
+            'query_count': query_count,
+            'duration': duration,
+            'sql_time': sql_time or 0.0,
+            'python_time': duration - (sql_time or 0.0),
+        })
+
+    @api.autovacuum
+    def _gc_perf_logs(self):
+        """Keep the log for 30 days."""
+        self.search([('create_date', '<', fields.Datetime.subtract(fields.Datetime.now(), days=30))]).unlink()
@@ -1,69 +1,151 @@
 # -*- coding: utf-8 -*-
+from collections import defaultdict
+
 from odoo import models, fields, api
+from .project_csl_perf_log import instrumented
+
+
+def _link_orders_to_projects(lines, order_field):
+    """Link the orders of `lines` and their invoices to the line's project.
+
+    Orders are grouped by target project and written once per project, and
+    records already linked to that project are left untouched. When the
+    context key ``project_csl_no_tracking`` is set, the links are written
+    without chatter tracking.
+    """
+    project_by_order = {}
+    for line in lines:
+        if line[order_field] and line.project_id:
+            project_by_order[line[order_field].id] = line.project_id.id
+    if not project_by_order:
+        return
+
+    order_ids_by_project = defaultdict(list)
+    for order_id, project_id in project_by_order.items():
+        order_ids_by_project[project_id].append(order_id)
+
+    env = lines.env
+    if env.context.get('project_csl_no_tracking'):
+        env = env(context=dict(env.context, mail_notrack=True))
+    Order = env[lines._fields[order_field].comodel_name]
+    for project_id, order_ids in order_ids_by_project.items():
+        orders = Order.browse(order_ids)
+        orders.filtered(lambda order: order.project_csl_id.id != project_id).write({
+            'project_csl_id': project_id
+        })
+        invoices = orders.invoice_ids.filtered(lambda move: move.project_csl_id.id != project_id)
+        if invoices:
+            invoices.write({'project_csl_id': project_id})
+
+
+def _convert_order_amounts(lines, order_field):
+    """Convert the order amounts of `lines` to the currency of the order's company.
+
+    Rates are looked up once per (currency, company, date) in the batch;
+    orders are converted at their order date.
+    """
+    rates = {}
+    for line in lines:
+        order = line[order_field]
+        company = order.company_id
+        if not company or not line.currency_id:
+            line.amount_untaxed_company = line.amount_tax_company = line.amount_total_company = 0.0
+            continue
+        date = fields.Date.to_date(order.date_order) or fields.Date.context_today(line)
+        key = (line.currency_id, company, date)
+        if key not in rates:
+            rates[key] = line.currency_id._get_conversion_rate(line.currency_id, company.currency_id, company, date)
+        rate = rates[key]
+        currency = company.currency_id
+        line.amount_untaxed_company = currency.round(line.amount_untaxed * rate)
+        line.amount_tax_company = currency.round(line.amount_tax * rate)
+        line.amount_total_company = currency.round(line.amount_total * rate)
+
 
 class ProjectQuotationLine(models.Model):
     _name = 'project.quotation.line'
     _description = 'Project Quotation Line'
 
-    project_id = fields.Many2one('project.csl', string='Project', required=True, ondelete='cascade')
+    project_id = fields.Many2one('project.csl', string='Project', required=True, ondelete='cascade', index=True)
     quotation_id = fields.Many2one(
         'sale.order', 
         string='Quotation', 
         required=True,
+        index=True,
         domain="[('state', 'in', ['draft', 'sent', 'sale']), ('partner_id', '=', parent.customer_id)]"
     )
     
-    # Related fields for display in the tree view
+    # Order amounts, stored so project totals can be summed in SQL
     amount_untaxed = fields.Monetary(
         string='Tax Excluded', 
         related='quotation_id.amount_untaxed', 
+        store=True,
         readonly=True
     )
     amount_tax = fields.Monetary(
         string='Tax', 
         related='quotation_id.amount_tax', 
+        store=True,
         readonly=True
     )
     amount_total = fields.Monetary(
         string='Total Amount', 
         related='quotation_id.amount_total', 
+        store=True,
         readonly=True
     )
     currency_id = fields.Many2one(
         related='quotation_id.currency_id', 
+        store=True,
+        readonly=True
+    )
+
+    # Same amounts in company currency, at the rate of the order date
+    company_currency_id = fields.Many2one(
+        'res.currency',
+        string='Company Currency',
+        related='quotation_id.company_id.currency_id',
+        store=True,
         readonly=True
     )
+    amount_untaxed_company = fields.Monetary(
+        string='Tax Excluded (Company Currency)',
+        currency_field='company_currency_id',
+        compute='_compute_company_amounts',
+        store=True
+    )
+    amount_tax_company = fields.Monetary(
+        string='Tax (Company Currency)',
+        currency_field='company_currency_id',
+        compute='_compute_company_amounts',
+        store=True
+    )
+    amount_total_company = fields.Monetary(
+        string='Total (Company Currency)',
+        currency_field='company_currency_id',
+        compute='_compute_company_amounts',
+        store=True
+    )
+
+    @api.depends('amount_untaxed', 'amount_tax', 'amount_total', 'currency_id',
+                 'quotation_id.date_order', 'quotation_id.company_id')
+    def _compute_company_amounts(self):
+        _convert_order_amounts(self, 'quotation_id')
 
     @api.model_create_multi
+    @instrumented
     def create(self, vals_list):
         """Link the quotation and its invoices back to the project on creation."""
         lines = super().create(vals_list)
-        for line in lines:
-            if line.quotation_id and line.project_id:
-                # Link quotation to project
-                line.quotation_id.project_csl_id = line.project_id
-                
-                # Link existing invoices from this quotation to the project
-                if line.quotation_id.invoice_ids:
-                    line.quotation_id.invoice_ids.write({
-                        'project_csl_id': line.project_id.id
-                    })
+        _link_orders_to_projects(lines, 'quotation_id')
         return lines
 
+    @instrumented
     def write(self, vals):
         """Update the quotation link and its invoices if it changes."""
         res = super().write(vals)
         if 'quotation_id' in vals or 'project_id' in vals:
-            for line in self:
-                if line.quotation_id and line.project_id:
-                    # Link quotation to project
-                    line.quotation_id.project_csl_id = line.project_id
-                    
-                    # Link existing invoices from this quotation to the project
-                    if line.quotation_id.invoice_ids:
-                        line.quotation_id.invoice_ids.write({
-                            'project_csl_id': line.project_id.id
-                        })
+            _link_orders_to_projects(self, 'quotation_id')
         return res
 
 # --- MODEL FOR PURCHASE ORDER LINES ---
@@ -72,11 +154,12 @@ class ProjectPurchaseLine(models.Model):
     _name = 'project.purchase.line'
     _description = 'Project Purchase Line'
 
-    project_id = fields.Many2one('project.csl', string='Project', required=True, ondelete='cascade')
+    project_id = fields.Many2one('project.csl', string='Project', required=True, ondelete='cascade', index=True)
     purchase_order_id = fields.Many2one(
         'purchase.order', 
         string='Purchase Order', 
         required=True,
+        index=True,
         domain="[('state', 'in', ['draft', 'sent', 'to approve', 'purchase'])]"
     )
     
@@ -86,56 +169,78 @@ class ProjectPurchaseLine(models.Model):
         related='purchase_order_id.partner_id',
         readonly=True
     )
+
+    # Order amounts, stored so project totals can be summed in SQL
     amount_untaxed = fields.Monetary(
         string='Tax Excluded', 
         related='purchase_order_id.amount_untaxed', 
+        store=True,
         readonly=True
     )
     amount_tax = fields.Monetary(
         string='Tax', 
         related='purchase_order_id.amount_tax', 
+        store=True,
         readonly=True
     )
     amount_total = fields.Monetary(
         string='Total Amount', 
         related='purchase_order_id.amount_total', 
+        store=True,
         readonly=True
     )
     currency_id = fields.Many2one(
         related='purchase_order_id.currency_id', 
+        store=True,
         readonly=True
     )
 
+    # Same amounts in company currency, at the rate of the order date
+    company_currency_id = fields.Many2one(
+        'res.currency',
+        string='Company Currency',
+        related='purchase_order_id.company_id.currency_id',
+        store=True,
+        readonly=True
+    )
+    amount_untaxed_company = fields.Monetary(
+        string='Tax Excluded (Company Currency)',
+        currency_field='company_currency_id',
+        compute='_compute_company_amounts',
+        store=True
+    )
+    amount_tax_company = fields.Monetary(
+        string='Tax (Company Currency)',
+        currency_field='company_currency_id',
+        compute='_compute_company_amounts',
+        store=True
+    )
+    amount_total_company = fields.Monetary(
+        string='Total (Company Currency)',
+        currency_field='company_currency_id',
+        compute='_compute_company_amounts',
+        store=True
+    )
+
+    @api.depends('amount_untaxed', 'amount_tax', 'amount_total', 'currency_id',
+                 'purchase_order_id.date_order', 'purchase_order_id.company_id')
+    def _compute_company_amounts(self):
+        _convert_order_amounts(self, 'purchase_order_id')
+
     @api.model_create_multi
+    @instrumented
     def create(self, vals_list):
         """Link the purchase order and its bills back to the project on creation."""
         lines = super().create(vals_list)
-        for line in lines:
-            if line.purchase_order_id and line.project_id:
-                # Link PO to project
-                line.purchase_order_id.project_csl_id = line.project_id
-                
-                # Link existing vendor bills from this PO to the project
-                if line.purchase_order_id.invoice_ids:
-                    line.purchase_order_id.invoice_ids.write({
-                        'project_csl_id': line.project_id.id
-                    })
+        _link_orders_to_projects(lines, 'purchase_order_id')
         return lines
 
+    @instrumented
     def write(self, vals):
         """Update the purchase order link and its bills if it changes."""
         res = super().write(vals)
         if 'purchase_order_id' in vals or 'project_id' in vals:
-            for line in self:
-                if line.purchase_order_id and line.project_id:
-                    # Link PO to project
-                    line.purchase_order_id.project_csl_id = line.project_id
-                    
-                    # Link existing vendor bills from this PO to the project
-                    if line.purchase_order_id.invoice_ids:
-                        line.purchase_order_id.invoice_ids.write({
-                            'project_csl_id': line.project_id.id
-                        })
+            _link_orders_to_projects(self, 'purchase_order_id')
         return res
 
 # --- MODEL FOR EMPLOYEE PURCHASE REQUISITION LINES ---
@@ -144,7 +249,7 @@ class ProjectEmployeeRequisitionLine(models.Model):
     _name = 'project.employee.requisition.line'
     _description = 'Project Employee Requisition Line'
 
-    project_id = fields.Many2one('project.csl', string='Project', required=True, ondelete='cascade')
+    project_id = fields.Many2one('project.csl', string='Project', required=True, ondelete='cascade', index=True)
     requisition_id = fields.Many2one(
         'employee.purchase.requisition', 
         string='Purchase Requisition', 
@@ -1,5 +1,5 @@
 # -*- coding: utf-8 -*-
-from odoo import models, fields
+from odoo import models, fields, api, tools
 
 class PurchaseOrder(models.Model):
     _inherit = 'purchase.order'
@@ -10,15 +10,53 @@ class PurchaseOrder(models.Model):
         help="Linked Project",
         ondelete='set null',
         copy=False,
-        tracking=True
+        tracking=True,
+        index='btree_not_null'
     )
     project_reference = fields.Char(
         string="Project Reference",
-        related='project_csl_id.project_reference',
+        compute='_compute_project_reference',
         store=True,
-        readonly=True
+        readonly=True,
+        index='btree_not_null'
     )
 
+    @api.depends('project_csl_id')
+    def _compute_project_reference(self):
+        """Reference changes on the project are propagated by project.csl._sync_document_references."""
+        for order in self:
+            order.project_reference = order.project_csl_id.project_reference
+
+    def init(self):
+        super().init()
+        # Origin resolution of invoices/bills looks up linked orders by name
+        tools.create_index(
+            self.env.cr, 'purchase_order_name_project_csl_index',
+            self._table, ['name'],
+            where='project_csl_id IS NOT NULL',
+        )
+
+    @api.model_create_multi
+    def create(self, vals_list):
+        orders = super().create(vals_list)
+        self.env['project.csl.financial.summary']._mark_projects_dirty(orders.project_csl_id.ids)
+        return orders
+
+    def write(self, vals):
+        old_project_ids = self.project_csl_id.ids
+        res = super().write(vals)
+        self.env['project.csl.financial.summary']._mark_projects_dirty(
+            old_project_ids + self.project_csl_id.ids)
+        return res
+
+    def unlink(self):
+        self.env['project.csl.financial.summary']._mark_projects_dirty(self.project_csl_id.ids)
+        return super().unlink()
+
+    def _job_attach_to_project_csl(self, project_id):
+        """Job entry point of the mass attach wizard."""
+        self.env['project.csl.attach.wizard']._attach_orders(self._name, self.ids, project_id)
+
     def action_view_project(self):
         """Smart button action to view the related project."""
         self.ensure_one()
@@ -0,0 +1,11 @@
+# -*- coding: utf-8 -*-
+from odoo import models
+
+class ResGroups(models.Model):
+    _inherit = 'res.groups'
+
+    def unlink(self):
+        res = super().unlink()
+        # Drop the cached CSL role -> group mapping
+        self.env.registry.clear_cache()
+        return res
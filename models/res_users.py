@@ -1,5 +1,16 @@
 # -*- coding: utf-8 -*-
-from odoo import models, fields, api
+from collections import defaultdict
+
+from odoo import models, fields, api, tools
+
+# Role keys by priority, with the xml id of their group
+CSL_ROLE_GROUP_XMLIDS = [
+    ('ceo', 'concept_project_management.group_project_csl_ceo'),
+    ('project_manager', 'concept_project_management.group_project_csl_project_manager'),
+    ('purchase_manager', 'concept_project_management.group_project_csl_purchase_manager'),
+    ('hr_manager', 'concept_project_management.group_project_csl_hr_manager'),
+    ('account_manager', 'concept_project_management.group_project_csl_account_manager'),
+]
 
 class ResUsers(models.Model):
     _inherit = 'res.users'
@@ -17,46 +28,92 @@ class ResUsers(models.Model):
        inverse='_inverse_csl_project_role',
        store=False) # store=False is correct for compute/inverse on groups_id
 
-    # 2. Helper method to get all role groups
+    # 2. Helper methods to get all role groups
+    @tools.ormcache()
+    def _get_csl_role_group_ids(self):
+        """Returns the (role key, group id) pairs of existing role groups, by priority.
+
+        Cached per registry; the cache is cleared when a group is deleted.
+        """
+        role_group_ids = []
+        for role, xmlid in CSL_ROLE_GROUP_XMLIDS:
+            group = self.env.ref(xmlid, raise_if_not_found=False)
+            if group:
+                role_group_ids.append((role, group.id))
+        return tuple(role_group_ids)
+
     def _get_csl_role_groups(self):
         """Returns a dictionary mapping role key to the group record."""
         return {
-            'ceo': self.env.ref('concept_project_management.group_project_csl_ceo', raise_if_not_found=False),
-            'project_manager': self.env.ref('concept_project_management.group_project_csl_project_manager', raise_if_not_found=False),
-            'purchase_manager': self.env.ref('concept_project_management.group_project_csl_purchase_manager', raise_if_not_found=False),
-            'hr_manager': self.env.ref('concept_project_management.group_project_csl_hr_manager', raise_if_not_found=False),
-            'account_manager': self.env.ref('concept_project_management.group_project_csl_account_manager', raise_if_not_found=False),
+            role: self.env['res.groups'].browse(group_id)
+            for role, group_id in self._get_csl_role_group_ids()
         }
 
     # 3. COMPUTE: Read the user's groups and set the dropdown
     @api.depends('groups_id')
     def _compute_csl_project_role(self):
-        role_groups = self._get_csl_role_groups()
-        # Create a reverse mapping {group_id: role_key}
-        group_to_role = {group.id: role for role, group in role_groups.items() if group}
-        
+        role_group_ids = self._get_csl_role_group_ids()
+        group_to_role = {group_id: role for role, group_id in role_group_ids}
+        role_priority = {role: priority for priority, (role, _group_id) in enumerate(role_group_ids)}
+
+        # Saved users: one query on the relation table for the whole batch
+        user_roles = {}
+        user_ids = [user_id for user_id in self.ids if user_id]
+        if user_ids and group_to_role:
+            self.flush_model(['groups_id'])
+            self.env.cr.execute("""
+                SELECT uid, gid
+                  FROM res_groups_users_rel
+                 WHERE uid IN %s
+                   AND gid IN %s
+            """, (tuple(user_ids), tuple(group_to_role)))
+            for user_id, group_id in self.env.cr.fetchall():
+                role = group_to_role[group_id]
+                current = user_roles.get(user_id)
+                if current is None or role_priority[role] < role_priority[current]:
+                    user_roles[user_id] = role
+
         for user in self:
-            user.csl_project_role = 'none' # Default
-            user_group_ids = user.groups_id.ids
-            for group_id, role_key in group_to_role.items():
-                if group_id in user_group_ids:
-                    user.csl_project_role = role_key
-                    break # Found the highest role, stop searching
+            if user.id:
+                user.csl_project_role = user_roles.get(user.id, 'none')
+                continue
+            # New records only have their groups in cache
+            user.csl_project_role = next(
+                (group_to_role[group_id] for group_id in sorted(
+                    set(user.groups_id._origin.ids) & set(group_to_role),
+                    key=lambda gid: role_priority[group_to_role[gid]])),
+                'none',
+            )
 
     # 4. INVERSE: Read the dropdown and set the user's groups
     def _inverse_csl_project_role(self):
-        role_groups = self._get_csl_role_groups()
-        all_role_groups = self.env['res.groups'].concat(*[g for g in role_groups.values() if g])
+        self._apply_csl_project_roles({user.id: user.csl_project_role for user in self})
 
-        for user in self:
-            if not user.csl_project_role or user.csl_project_role == 'none':
-                # If 'None' is selected, remove user from all CSL roles
-                user.groups_id -= all_role_groups
-            else:
-                # Get the group record for the selected role
-                selected_group = role_groups.get(user.csl_project_role)
-                if selected_group:
-                    # Remove all roles, then add the selected one
-                    # This ensures exclusivity
-                    user.groups_id -= all_role_groups
-                    user.groups_id += selected_group
\ No newline at end of file
+    def _set_csl_project_role(self, role):
+        """Bulk API: give all users in self the same CSL role ('none' removes it)."""
+        self._apply_csl_project_roles({user.id: role for user in self})
+        self.invalidate_recordset(['csl_project_role'])
+
+    def _apply_csl_project_roles(self, role_by_user):
+        """Make each user a member of exactly the group of its role.
+
+        Issues one write per role group for the whole batch of users.
+        """
+        role_group_ids = self._get_csl_role_group_ids()
+        known_roles = {role for role, _group_id in role_group_ids} | {'none'}
+        users_by_role = defaultdict(list)
+        for user_id, role in role_by_user.items():
+            role = role or 'none'
+            # Leave users alone when the group of their role does not exist
+            if role in known_roles:
+                users_by_role[role].append(user_id)
+
+        for role, group_id in role_group_ids:
+            commands = [
+                fields.Command.unlink(user_id)
+                for user_role, user_ids in users_by_role.items() if user_role != role
+                for user_id in user_ids
+            ]
+            commands += [fields.Command.link(user_id) for user_id in users_by_role.get(role, [])]
+            if commands:
+                self.env['res.groups'].browse(group_id).write({'users': commands})
@@ -24,4 +24,5 @@ class ProjectScopeLine(models.Model):
 
     name = fields.Char(string='Work Description', required=True)
     sequence = fields.Integer(string='Sequence', default=10)
-    project_id = fields.Many2one('project.csl', string='Project', required=True, ondelete='cascade')
\ No newline at end of file
+    project_id = fields.Many2one('project.csl', string='Project', required=True, ondelete='cascade', index=True)
+    template_line_id = fields.Many2one('scope.work.line', string='Template Line', ondelete='set null', readonly=True)
\ No newline at end of file
@@ -0,0 +1,5 @@
+# -*- coding: utf-8 -*-
+from . import scope_work
+from . import project_csl
+from . import documents
+from . import project_lines
@@ -0,0 +1,40 @@
+# -*- coding: utf-8 -*-
+from odoo import models
+from odoo.tools import populate
+
+
+def _project_factory(env):
+    """Link roughly two documents out of three to a populated project."""
+    project_ids = env.registry.populated_models['project.csl']
+    return ('project_csl_id', populate.randomize(
+        [False] + project_ids, [len(project_ids) // 2 or 1] + [1] * len(project_ids)))
+
+class SaleOrder(models.Model):
+    _inherit = 'sale.order'
+
+    @property
+    def _populate_dependencies(self):
+        return super()._populate_dependencies + ['project.csl']
+
+    def _populate_factories(self):
+        return super()._populate_factories() + [_project_factory(self.env)]
+
+class PurchaseOrder(models.Model):
+    _inherit = 'purchase.order'
+
+    @property
+    def _populate_dependencies(self):
+        return super()._populate_dependencies + ['project.csl']
+
+    def _populate_factories(self):
+        return super()._populate_factories() + [_project_factory(self.env)]
+
+class AccountMove(models.Model):
+    _inherit = 'account.move'
+
+    @property
+    def _populate_dependencies(self):
+        return super()._populate_dependencies + ['project.csl']
+
+    def _populate_factories(self):
+        return super()._populate_factories() + [_project_factory(self.env)]
@@ -0,0 +1,37 @@
+# -*- coding: utf-8 -*-
+from datetime import date, timedelta
+
+from odoo import models
+from odoo.tools import populate
+
+# Fixed reference date so generated data only depends on the populate seed
+POPULATE_REFERENCE_DATE = date(2024, 1, 1)
+
+
+class ProjectCsl(models.Model):
+    _inherit = 'project.csl'
+    _populate_sizes = {'small': 100, 'medium': 5000, 'large': 100000}
+    _populate_dependencies = ['res.company', 'res.partner', 'scope.work.set']
+
+    def _populate_factories(self):
+        company_ids = self.env.registry.populated_models['res.company'] or self.env.company.ids
+        partner_ids = self.env.registry.populated_models['res.partner']
+        set_ids = self.env.registry.populated_models['scope.work.set']
+
+        def get_date_start(random=None, **kwargs):
+            return POPULATE_REFERENCE_DATE - timedelta(days=random.randint(0, 730))
+
+        def get_date_end(values=None, random=None, **kwargs):
+            return values['date_start'] + timedelta(days=random.randint(30, 365))
+
+        return [
+            ('name', populate.constant('Project {counter}')),
+            ('company_id', populate.randomize(company_ids)),
+            ('customer_id', populate.randomize(partner_ids)),
+            ('partner_id', populate.randomize([False] + partner_ids)),
+            ('state', populate.randomize(['draft', 'confirm', 'done'], [3, 5, 2])),
+            ('date_start', populate.compute(get_date_start)),
+            ('date_end', populate.compute(get_date_end)),
+            # Most projects start from a scope set, copied with one INSERT ... SELECT per batch
+            ('scope_work_set_id', populate.randomize([False] + set_ids, [1] + [3] * len(set_ids))),
+        ]
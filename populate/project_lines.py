@@ -0,0 +1,48 @@
+# -*- coding: utf-8 -*-
+from odoo import models
+from odoo.tools import populate
+
+
+def _order_line_factories(env, order_model, order_field):
+    """Project line factories walking the populated orders that have a project.
+
+    Each line points to one order and to the order's own project, so the
+    line hooks keep the existing links.
+    """
+    orders = env[order_model].search_fetch([
+        ('id', 'in', env.registry.populated_models[order_model]),
+        ('project_csl_id', '!=', False),
+    ], ['project_csl_id'], order='id')
+    project_by_order = {order.id: order.project_csl_id.id for order in orders}
+    if not project_by_order:
+        return []
+
+    def get_project(values=None, **kwargs):
+        return project_by_order[values[order_field]]
+
+    return [
+        (order_field, populate.iterate(list(project_by_order))),
+        ('project_id', populate.compute(get_project)),
+    ]
+
+class ProjectQuotationLine(models.Model):
+    _inherit = 'project.quotation.line'
+    _populate_sizes = {'small': 50, 'medium': 1000, 'large': 20000}
+    _populate_dependencies = ['project.csl', 'sale.order']
+
+    def _populate(self, size):
+        return super(ProjectQuotationLine, self.with_context(project_csl_no_tracking=True))._populate(size)
+
+    def _populate_factories(self):
+        return _order_line_factories(self.env, 'sale.order', 'quotation_id')
+
+class ProjectPurchaseLine(models.Model):
+    _inherit = 'project.purchase.line'
+    _populate_sizes = {'small': 50, 'medium': 1000, 'large': 20000}
+    _populate_dependencies = ['project.csl', 'purchase.order']
+
+    def _populate(self, size):
+        return super(ProjectPurchaseLine, self.with_context(project_csl_no_tracking=True))._populate(size)
+
+    def _populate_factories(self):
+        return _order_line_factories(self.env, 'purchase.order', 'purchase_order_id')
@@ -0,0 +1,38 @@
+# -*- coding: utf-8 -*-
+from odoo import models
+from odoo.tools import populate
+
+class ScopeWorkSet(models.Model):
+    _inherit = 'scope.work.set'
+    _populate_sizes = {'small': 10, 'medium': 50, 'large': 200}
+
+    def _populate_factories(self):
+        return [
+            ('name', populate.constant('Scope of Work {counter}')),
+        ]
+
+class ScopeWorkLine(models.Model):
+    _inherit = 'scope.work.line'
+    _populate_sizes = {'small': 100, 'medium': 1000, 'large': 10000}
+    _populate_dependencies = ['scope.work.set']
+
+    def _populate_factories(self):
+        set_ids = self.env.registry.populated_models['scope.work.set']
+        return [
+            ('set_id', populate.randomize(set_ids)),
+            ('name', populate.constant('Work Item {counter}')),
+            ('sequence', populate.randint(1, 100)),
+        ]
+
+class ProjectScopeLine(models.Model):
+    _inherit = 'project.scope.line'
+    _populate_sizes = {'small': 500, 'medium': 20000, 'large': 500000}
+    _populate_dependencies = ['project.csl']
+
+    def _populate_factories(self):
+        project_ids = self.env.registry.populated_models['project.csl']
+        return [
+            ('project_id', populate.randomize(project_ids)),
+            ('name', populate.constant('Custom Work Item {counter}')),
+            ('sequence', populate.randint(1, 100)),
+        ]
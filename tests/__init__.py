@@ -0,0 +1,9 @@
+# -*- coding: utf-8 -*-
+from . import test_perf_account_move
+from . import test_perf_project
+from . import test_perf_project_lines
+from . import test_perf_res_users
+from . import test_perf_project_concurrency
+from . import test_perf_indexes
+from . import test_perf_kpi
+from . import test_perf_search
@@ -0,0 +1,186 @@
+# -*- coding: utf-8 -*-
+import json
+import os
+import tempfile
+import time
+from contextlib import contextmanager
+
+from odoo.tests.common import HttpCase, TransactionCase
+from odoo.tools.sql import SQL
+
+# Data sizes every scenario is run at
+PERF_SIZES = (10, 100, 500)
+
+# Query budgets are fixed upper bounds with headroom, the same at every size.
+# A scenario going over budget is a regression; lower the budget when a
+# scenario gets cheaper.
+
+# Queries a scenario may add between the smallest and the largest size
+PERF_FLAT_SLACK = 5
+
+# JSON file collecting the timings of the perf suite, can be overridden from the environment
+PERF_REPORT_PATH = os.environ.get(
+    'PROJECT_CSL_PERF_REPORT', os.path.join(tempfile.gettempdir(), 'project_csl_perf_report.json'))
+
+
+class ProjectCslPerfMixin:
+    """Shared helpers of the ``perf`` suite.
+
+    Scenarios run through :meth:`_run_scenario`, which enforces a query
+    budget with ``assertQueryCount`` and records the wall-clock time and the
+    query count of each (scenario, size) pair. The results of a test class
+    are merged into the JSON report at :data:`PERF_REPORT_PATH` once the
+    class is done.
+    """
+
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls._perf_results = {}
+        cls.customer = cls.env['res.partner'].create({'name': 'Perf Customer'})
+        cls.vendor = cls.env['res.partner'].create({'name': 'Perf Vendor'})
+        cls.product = cls.env['product.product'].create({
+            'name': 'Perf Service',
+            'type': 'service',
+            'list_price': 100.0,
+            'standard_price': 60.0,
+            'invoice_policy': 'order',
+        })
+
+    @classmethod
+    def tearDownClass(cls):
+        cls._write_perf_report()
+        super().tearDownClass()
+
+    @classmethod
+    def _write_perf_report(cls):
+        if not cls._perf_results:
+            return
+        report = {}
+        if os.path.exists(PERF_REPORT_PATH):
+            with open(PERF_REPORT_PATH, encoding='utf-8') as report_file:
+                try:
+                    report = json.load(report_file)
+                except ValueError:
+                    report = {}
+        report.setdefault(cls.__name__, {}).update(cls._perf_results)
+        with open(PERF_REPORT_PATH, 'w', encoding='utf-8') as report_file:
+            json.dump(report, report_file, indent=2, sort_keys=True)
+
+    # --- Measuring ---
+
+    @contextmanager
+    def _measure(self, scenario, size):
+        """Record the time and number of queries of the block under `scenario`."""
+        self.env.flush_all()
+        query_count = self.env.cr.sql_log_count
+        start = time.perf_counter()
+        yield
+        self.env.flush_all()
+        self._perf_results.setdefault(scenario, {})[str(size)] = {
+            'seconds': round(time.perf_counter() - start, 4),
+            'queries': self.env.cr.sql_log_count - query_count,
+        }
+
+    @contextmanager
+    def _run_scenario(self, scenario, size, query_budget):
+        """Measure the block and fail when it exceeds `query_budget` queries."""
+        with self._measure(scenario, size), self.assertQueryCount(query_budget):
+            yield
+
+    def _get_query_count(self, scenario, size):
+        return self._perf_results[scenario][str(size)]['queries']
+
+    def assertQueryCountFlat(self, scenario, sizes=PERF_SIZES):
+        """Assert `scenario` issues about as many queries at every size.
+
+        The count at the largest size may exceed the count at the smallest
+        size by :data:`PERF_FLAT_SLACK` queries at most.
+        """
+        smallest = self._get_query_count(scenario, min(sizes))
+        largest = self._get_query_count(scenario, max(sizes))
+        self.assertLessEqual(
+            largest, smallest + PERF_FLAT_SLACK,
+            f"{scenario} issues queries per record: {smallest} at {min(sizes)}, {largest} at {max(sizes)}",
+        )
+
+    # --- Query Plans ---
+
+    def _get_plan_indexes(self, model_name, domain):
+        """Names of the indexes in the plan of the search query of `domain`.
+
+        Sequential scans are disabled for the EXPLAIN, so the plan shows
+        whether an index can serve the query at all, independently of the
+        size of the test database.
+        """
+        query = self.env[model_name]._search(domain)
+        self.env.flush_all()
+        self.env.cr.execute("SET LOCAL enable_seqscan = off")
+        try:
+            self.env.cr.execute(SQL("EXPLAIN (FORMAT JSON) %s", query.select()))
+            plan = self.env.cr.fetchone()[0]
+        finally:
+            self.env.cr.execute("SET LOCAL enable_seqscan = on")
+
+        indexes = set()
+
+        def collect(node):
+            if 'Index Name' in node:
+                indexes.add(node['Index Name'])
+            for child in node.get('Plans', []):
+                collect(child)
+        collect(plan[0]['Plan'])
+        return indexes
+
+    def assertUsesIndex(self, model_name, domain, index_names):
+        """Assert the search of `domain` is served by one of `index_names`."""
+        used = self._get_plan_indexes(model_name, domain)
+        self.assertTrue(
+            used & set(index_names),
+            f"{model_name} search {domain} should use one of {sorted(index_names)}, plan uses {sorted(used) or 'no index'}",
+        )
+
+    # --- Data ---
+
+    @classmethod
+    def _create_projects(cls, count, **values):
+        return cls.env['project.csl'].create([
+            {'name': f"Perf Project {index}", 'customer_id': cls.customer.id, **values}
+            for index in range(count)
+        ])
+
+    @classmethod
+    def _create_sale_orders(cls, count, confirm=False):
+        orders = cls.env['sale.order'].create([{
+            'partner_id': cls.customer.id,
+            'order_line': [(0, 0, {'product_id': cls.product.id, 'product_uom_qty': 1})],
+        } for _index in range(count)])
+        if confirm:
+            orders.action_confirm()
+        return orders
+
+    @classmethod
+    def _create_purchase_orders(cls, count):
+        return cls.env['purchase.order'].create([{
+            'partner_id': cls.vendor.id,
+            'order_line': [(0, 0, {'product_id': cls.product.id, 'product_qty': 1, 'price_unit': 60.0})],
+        } for _index in range(count)])
+
+    @classmethod
+    def _attach_orders(cls, project, sale_orders=None, purchase_orders=None):
+        if sale_orders:
+            cls.env['project.quotation.line'].create([
+                {'project_id': project.id, 'quotation_id': order.id} for order in sale_orders
+            ])
+        if purchase_orders:
+            cls.env['project.purchase.line'].create([
+                {'project_id': project.id, 'purchase_order_id': order.id} for order in purchase_orders
+            ])
+
+
+class ProjectCslPerfCase(ProjectCslPerfMixin, TransactionCase):
+    """Base class of the ``perf`` suite."""
+
+
+class ProjectCslPerfHttpCase(ProjectCslPerfMixin, HttpCase):
+    """Base class of the ``perf`` scenarios driven through HTTP."""
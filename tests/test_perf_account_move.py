@@ -0,0 +1,106 @@
+# -*- coding: utf-8 -*-
+from odoo.tests import tagged
+
+from .common import ProjectCslPerfCase, PERF_SIZES
+
+
+@tagged('post_install', '-at_install', '-standard', 'perf')
+class TestPerfAccountMove(ProjectCslPerfCase):
+
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.project = cls._create_projects(1)
+        cls.sale_orders = cls._create_sale_orders(max(PERF_SIZES))
+        cls.purchase_orders = cls._create_purchase_orders(max(PERF_SIZES))
+        cls._attach_orders(cls.project, cls.sale_orders, cls.purchase_orders)
+
+    def _prepare_moves(self, size, with_origin=True):
+        vals_list = []
+        for index in range(size):
+            if index % 2:
+                order = self.purchase_orders[index]
+                vals_list.append({
+                    'move_type': 'in_invoice',
+                    'partner_id': self.vendor.id,
+                    'ref': order.name if with_origin else False,
+                })
+            else:
+                order = self.sale_orders[index]
+                vals_list.append({
+                    'move_type': 'out_invoice',
+                    'partner_id': self.customer.id,
+                    'invoice_origin': order.name if with_origin else False,
+                })
+        return vals_list
+
+    def test_perf_create_resolves_origins(self):
+        for size in PERF_SIZES:
+            vals_list = self._prepare_moves(size)
+            with self._run_scenario('account_move_create', size, 150):
+                moves = self.env['account.move'].create(vals_list)
+            self.assertEqual(moves.project_csl_id, self.project)
+        self.assertQueryCountFlat('account_move_create')
+
+    def test_perf_write_links_origins(self):
+        for size in PERF_SIZES:
+            moves = self.env['account.move'].create([
+                {'move_type': 'out_invoice', 'partner_id': self.customer.id}
+                for _index in range(size)
+            ])
+            self.assertFalse(moves.project_csl_id)
+            with self._run_scenario('account_move_write', size, 60):
+                moves.write({'invoice_origin': self.sale_orders[0].name})
+            self.assertEqual(moves.project_csl_id, self.project)
+        self.assertQueryCountFlat('account_move_write')
+
+    def test_perf_resolver_query_count_is_flat(self):
+        """Resolving a batch costs one query per order model, whatever its size."""
+        AccountMove = self.env['account.move']
+        for size in PERF_SIZES:
+            origins = []
+            for index in range(size):
+                if index % 2:
+                    origins.append(('in_invoice', False, self.purchase_orders[index].name))
+                else:
+                    # Multi-origin values are split on commas
+                    origins.append(('out_invoice', f"UNKNOWN, {self.sale_orders[index].name}", False))
+            self.env.invalidate_all()
+            with self._run_scenario('resolve_origin_projects', size, 2):
+                project_ids = AccountMove._resolve_origin_projects(origins)
+            self.assertEqual(project_ids, [self.project.id] * size)
+        counts = {self._get_query_count('resolve_origin_projects', size) for size in PERF_SIZES}
+        self.assertEqual(len(counts), 1, "Origin resolution should not issue more queries for larger batches")
+
+    def test_perf_create_resolution_overhead_is_flat(self):
+        """Origins add the same number of queries to create(), whatever the batch size."""
+        # Warm up the caches so the first measured batch is not penalized
+        self.env['account.move'].create(self._prepare_moves(2))
+        overheads = set()
+        for size in PERF_SIZES:
+            without_origin = self._prepare_moves(size, with_origin=False)
+            with_origin = self._prepare_moves(size)
+            with self._measure('account_move_create_no_origin', size):
+                self.env['account.move'].create(without_origin)
+            with self._measure('account_move_create_with_origin', size):
+                moves = self.env['account.move'].create(with_origin)
+            self.assertEqual(moves.project_csl_id, self.project)
+            overheads.add(
+                self._get_query_count('account_move_create_with_origin', size)
+                - self._get_query_count('account_move_create_no_origin', size)
+            )
+        self.assertEqual(len(overheads), 1, f"Origin resolution overhead grows with the batch: {overheads}")
+
+    def test_perf_write_benchmark_5k_moves(self):
+        """Mass edit of the origin of 5000 moves: one lookup and one write per project."""
+        size = 5000
+        moves = self.env['account.move'].create([
+            {'move_type': 'out_invoice', 'partner_id': self.customer.id}
+            for _index in range(size)
+        ])
+        # Flat part plus one lookup and one grouped write per linked project
+        project_count = len(self.project)
+        with self._run_scenario('account_move_write_benchmark', size, 60 + 5 * project_count):
+            moves.write({'invoice_origin': self.sale_orders[0].name})
+        self.assertEqual(moves.project_csl_id, self.project)
+        self.assertEqual(set(moves.mapped('project_reference')), {self.project.project_reference})
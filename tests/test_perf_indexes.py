@@ -0,0 +1,48 @@
+# -*- coding: utf-8 -*-
+from odoo.tests import tagged
+
+from .common import ProjectCslPerfCase
+
+
+@tagged('post_install', '-at_install', '-standard', 'perf')
+class TestPerfIndexes(ProjectCslPerfCase):
+    """The module's main lookups can be served by its indexes."""
+
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.project = cls._create_projects(1)
+        cls.sale_orders = cls._create_sale_orders(5)
+        cls.purchase_orders = cls._create_purchase_orders(5)
+        cls._attach_orders(cls.project, cls.sale_orders, cls.purchase_orders)
+
+    def test_project_document_domains(self):
+        for move_type in ('out_invoice', 'in_invoice'):
+            self.assertUsesIndex('account.move', [
+                ('project_csl_id', '=', self.project.id),
+                ('move_type', '=', move_type),
+            ], {'account_move_project_csl_id_move_type_index', 'account_move__project_csl_id_index'})
+        self.assertUsesIndex('sale.order', [('project_csl_id', '=', self.project.id)],
+                             {'sale_order__project_csl_id_index'})
+        self.assertUsesIndex('purchase.order', [('project_csl_id', '=', self.project.id)],
+                             {'purchase_order__project_csl_id_index'})
+
+    def test_origin_lookups(self):
+        self.assertUsesIndex('sale.order', [
+            ('name', 'in', self.sale_orders.mapped('name')),
+            ('project_csl_id', '!=', False),
+        ], {'sale_order_name_project_csl_index', 'sale_order__name_index'})
+        self.assertUsesIndex('purchase.order', [
+            ('name', 'in', self.purchase_orders.mapped('name')),
+            ('project_csl_id', '!=', False),
+        ], {'purchase_order_name_project_csl_index', 'purchase_order__name_index'})
+
+    def test_project_line_and_reference_lookups(self):
+        self.assertUsesIndex('project.quotation.line', [('project_id', '=', self.project.id)],
+                             {'project_quotation_line__project_id_index'})
+        self.assertUsesIndex('project.purchase.line', [('project_id', '=', self.project.id)],
+                             {'project_purchase_line__project_id_index'})
+        self.assertUsesIndex('account.move', [('project_reference', '=', self.project.project_reference)],
+                             {'account_move__project_reference_index'})
+        self.assertUsesIndex('project.csl', [('project_reference', '=', self.project.project_reference)],
+                             {'project_csl__project_reference_index'})
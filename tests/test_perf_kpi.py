@@ -0,0 +1,59 @@
+# -*- coding: utf-8 -*-
+import time
+
+from odoo.tests import tagged
+
+from odoo.addons.concept_project_management.controllers.main import _kpi_cache
+from .common import ProjectCslPerfHttpCase
+
+KPI_URL = '/project_csl/kpi'
+
+
+@tagged('post_install', '-at_install', '-standard', 'perf')
+class TestPerfKpiEndpoint(ProjectCslPerfHttpCase):
+    """Load benchmark of the KPI endpoint through a local HTTP client."""
+
+    project_count = 500
+    request_count = 200
+
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.projects = cls._create_projects(cls.project_count)
+        cls._attach_orders(cls.projects[0], cls._create_sale_orders(5), cls._create_purchase_orders(5))
+
+    def _benchmark(self, scenario, headers=None, expected_status=200):
+        start = time.perf_counter()
+        for _index in range(self.request_count):
+            response = self.url_open(KPI_URL, headers=headers)
+            self.assertEqual(response.status_code, expected_status)
+        seconds = time.perf_counter() - start
+        self._perf_results[scenario] = {
+            'requests': self.request_count,
+            'seconds': round(seconds, 4),
+            'requests_per_second': round(self.request_count / seconds, 1) if seconds else None,
+            'avg_ms': round(1000 * seconds / self.request_count, 2),
+        }
+        return response
+
+    def test_perf_kpi_endpoint_load(self):
+        _kpi_cache.clear()
+        self.authenticate('admin', 'admin')
+
+        start = time.perf_counter()
+        response = self.url_open(KPI_URL)
+        self._perf_results['kpi_cold'] = {'seconds': round(time.perf_counter() - start, 4)}
+        self.assertEqual(response.status_code, 200)
+        payload = response.json()
+        self.assertGreaterEqual(len(payload['projects']), self.project_count)
+        self.assertIn('invoiced_amount', payload['projects'][0])
+        etag = response.headers['ETag']
+
+        # Cached payload, then unchanged data answered with 304 Not Modified
+        self._benchmark('kpi_warm')
+        response = self._benchmark('kpi_not_modified', headers={'If-None-Match': etag}, expected_status=304)
+        self.assertFalse(response.content)
+        self.assertLess(
+            self._perf_results['kpi_not_modified']['avg_ms'], self._perf_results['kpi_cold']['seconds'] * 1000,
+            "A 304 answer should be cheaper than computing the payload",
+        )
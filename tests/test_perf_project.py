@@ -0,0 +1,47 @@
+# -*- coding: utf-8 -*-
+from odoo.tests import tagged
+
+from .common import ProjectCslPerfCase, PERF_SIZES
+
+COUNTER_FIELDS = [
+    'quotation_count', 'invoice_count', 'purchase_order_count',
+    'project_bill_count', 'employee_requisition_count',
+]
+
+
+@tagged('post_install', '-at_install', '-standard', 'perf')
+class TestPerfProject(ProjectCslPerfCase):
+
+    def test_perf_create_allocates_references(self):
+        for size in PERF_SIZES:
+            with self._run_scenario('project_create', size, 60):
+                projects = self._create_projects(size)
+            references = projects.mapped('project_reference')
+            self.assertTrue(all(references))
+            self.assertEqual(len(set(references)), size)
+        self.assertQueryCountFlat('project_create')
+
+    def test_perf_action_create_invoice(self):
+        for size in PERF_SIZES:
+            project = self._create_projects(1)
+            self._attach_orders(project, self._create_sale_orders(size, confirm=True))
+            with self._run_scenario('project_action_create_invoice', size, 200):
+                action = project.action_create_invoice()
+            invoices = self.env['account.move'].search(action['domain'])
+            self.assertEqual(len(invoices), size)
+            self.assertEqual(invoices.project_csl_id, project)
+        self.assertQueryCountFlat('project_action_create_invoice')
+
+    def test_perf_smart_button_counters(self):
+        sale_orders = self._create_sale_orders(max(PERF_SIZES))
+        purchase_orders = self._create_purchase_orders(max(PERF_SIZES))
+        for size in PERF_SIZES:
+            projects = self._create_projects(size)
+            for index, project in enumerate(projects):
+                self._attach_orders(project, sale_orders[index:index + 1], purchase_orders[index:index + 1])
+            self.env.invalidate_all()
+            # Stored counters: one read for the whole batch, whatever its size
+            with self._run_scenario('project_read_counters', size, 2):
+                rows = projects.read(COUNTER_FIELDS)
+            self.assertTrue(all(row['quotation_count'] == 1 for row in rows))
+            self.assertTrue(all(row['purchase_order_count'] == 1 for row in rows))
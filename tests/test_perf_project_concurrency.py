@@ -0,0 +1,122 @@
+# -*- coding: utf-8 -*-
+import threading
+import time
+from contextlib import closing
+
+from psycopg2.errors import SerializationFailure
+
+from odoo import api, SUPERUSER_ID
+from odoo.sql_db import db_connect
+from odoo.tests import tagged
+
+from .common import ProjectCslPerfCase
+
+REFERENCE_IMPLEMENTATION_PARAM = 'concept_project_management.reference_implementation'
+
+
+@tagged('post_install', '-at_install', '-standard', 'perf')
+class TestPerfProjectConcurrency(ProjectCslPerfCase):
+    """Parallel project creators, each on its own database connection.
+
+    The test transaction is never visible to other connections, so the
+    creators work on committed data and everything they commit is removed
+    at the end of the test.
+    """
+
+    workers = 4
+    projects_per_worker = 25
+    max_attempts = 10
+
+    def _run_in_new_cursor(self, func):
+        with closing(db_connect(self.env.cr.dbname).cursor()) as cr:
+            result = func(api.Environment(cr, SUPERUSER_ID, {}))
+            cr.commit()
+            return result
+
+    def _set_implementation(self, implementation):
+        """Set the configured implementation and align the company sequence.
+
+        The sequence is created (or switched) here, once and committed, so
+        the creators only ever reserve references from it.
+        """
+        def set_param(env):
+            previous = env['ir.config_parameter'].get_param(REFERENCE_IMPLEMENTATION_PARAM)
+            env['ir.config_parameter'].set_param(REFERENCE_IMPLEMENTATION_PARAM, implementation)
+            Project = env['project.csl']
+            Project._apply_reference_implementation(
+                Project._get_or_create_company_sequence(env.company.id))
+            return previous
+        return self._run_in_new_cursor(set_param)
+
+    def _create_in_parallel(self):
+        """Start the creators together; each commits every project on its own.
+
+        A creation that loses a concurrent update of the gapless sequence
+        fails with a serialization error; it is rolled back and retried, as
+        the server does for requests.
+
+        :return: tuple (seconds, created project ids, retries, errors)
+        """
+        dbname = self.env.cr.dbname
+        barrier = threading.Barrier(self.workers + 1)
+        created_ids = []
+        retries = []
+        errors = []
+
+        def creator(worker):
+            try:
+                with closing(db_connect(dbname).cursor()) as cr:
+                    env = api.Environment(cr, SUPERUSER_ID, {})
+                    customer = env.ref('base.main_partner')
+                    barrier.wait()
+                    for index in range(self.projects_per_worker):
+                        for attempt in range(1, self.max_attempts + 1):
+                            try:
+                                project = env['project.csl'].create({
+                                    'name': f"Parallel Project {worker}-{index}",
+                                    'customer_id': customer.id,
+                                })
+                                cr.commit()
+                                break
+                            except SerializationFailure:
+                                cr.rollback()
+                                if attempt == self.max_attempts:
+                                    raise
+                                retries.append(worker)
+                        created_ids.append(project.id)
+            except Exception as error:
+                errors.append(error)
+
+        threads = [threading.Thread(target=creator, args=(worker,)) for worker in range(self.workers)]
+        for thread in threads:
+            thread.start()
+        barrier.wait()
+        start = time.perf_counter()
+        for thread in threads:
+            thread.join()
+        return time.perf_counter() - start, created_ids, len(retries), errors
+
+    def test_perf_parallel_creators(self):
+        previous = self._set_implementation('no_gap')
+        created_ids = []
+        try:
+            for implementation in ('no_gap', 'standard'):
+                self._set_implementation(implementation)
+                seconds, project_ids, retries, errors = self._create_in_parallel()
+                created_ids += project_ids
+                self.assertFalse(errors, f"Parallel creation failed with {implementation}: {errors}")
+                self._perf_results.setdefault('project_create_parallel', {})[implementation] = {
+                    'workers': self.workers,
+                    'projects': len(project_ids),
+                    'serialization_retries': retries,
+                    'seconds': round(seconds, 4),
+                    'projects_per_second': round(len(project_ids) / seconds, 1) if seconds else None,
+                }
+
+            def read_references(env):
+                return env['project.csl'].browse(created_ids).mapped('project_reference')
+            references = self._run_in_new_cursor(read_references)
+            self.assertEqual(len(set(references)), len(created_ids), "Project references must be unique")
+        finally:
+            self._set_implementation(previous or False)
+            self._run_in_new_cursor(lambda env: env['project.csl'].browse(created_ids).exists().unlink())
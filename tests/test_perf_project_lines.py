@@ -0,0 +1,56 @@
+# -*- coding: utf-8 -*-
+from odoo.tests import tagged
+
+from .common import ProjectCslPerfCase, PERF_SIZES
+
+
+@tagged('post_install', '-at_install', '-standard', 'perf')
+class TestPerfProjectLines(ProjectCslPerfCase):
+
+    def test_perf_quotation_line_linking(self):
+        for size in PERF_SIZES:
+            project = self._create_projects(1)
+            orders = self._create_sale_orders(size)
+            with self._run_scenario('quotation_line_create', size, 80):
+                self._attach_orders(project, sale_orders=orders)
+            self.assertEqual(orders.project_csl_id, project)
+            self.assertEqual(project.quotation_count, size)
+
+            other_project = self._create_projects(1)
+            with self._run_scenario('quotation_line_write', size, 80):
+                project.project_quotation_line_ids.write({'project_id': other_project.id})
+            self.assertEqual(orders.project_csl_id, other_project)
+        self.assertQueryCountFlat('quotation_line_create')
+        self.assertQueryCountFlat('quotation_line_write')
+
+    def test_perf_purchase_line_linking(self):
+        for size in PERF_SIZES:
+            project = self._create_projects(1)
+            orders = self._create_purchase_orders(size)
+            with self._run_scenario('purchase_line_create', size, 80):
+                self._attach_orders(project, purchase_orders=orders)
+            self.assertEqual(orders.project_csl_id, project)
+            self.assertEqual(project.purchase_order_count, size)
+
+            other_project = self._create_projects(1)
+            with self._run_scenario('purchase_line_write', size, 80):
+                project.project_purchase_line_ids.write({'project_id': other_project.id})
+            self.assertEqual(orders.project_csl_id, other_project)
+        self.assertQueryCountFlat('purchase_line_create')
+        self.assertQueryCountFlat('purchase_line_write')
+
+    def test_perf_500_lines_bounded_query_count(self):
+        """Creating 500 lines in one call links their orders with grouped writes."""
+        for model_name, order_field, create_orders, scenario in (
+            ('project.quotation.line', 'quotation_id', self._create_sale_orders, 'quotation_line_bulk_create'),
+            ('project.purchase.line', 'purchase_order_id', self._create_purchase_orders, 'purchase_line_bulk_create'),
+        ):
+            Line = self.env[model_name].with_context(project_csl_no_tracking=True)
+            for size in (50, 500):
+                project = self._create_projects(1)
+                orders = create_orders(size)
+                self.env.invalidate_all()
+                with self._run_scenario(scenario, size, 80):
+                    Line.create([{'project_id': project.id, order_field: order.id} for order in orders])
+                self.assertEqual(orders.project_csl_id, project)
+            self.assertQueryCountFlat(scenario, sizes=(50, 500))
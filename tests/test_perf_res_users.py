@@ -0,0 +1,36 @@
+# -*- coding: utf-8 -*-
+from odoo.tests import tagged
+
+from .common import ProjectCslPerfCase, PERF_SIZES
+
+
+@tagged('post_install', '-at_install', '-standard', 'perf')
+class TestPerfResUsers(ProjectCslPerfCase):
+
+    def _create_users(self, size):
+        return self.env['res.users'].with_context(no_reset_password=True).create([{
+            'name': f"Perf User {size}-{index}",
+            'login': f"perf_user_{size}_{index}",
+        } for index in range(size)])
+
+    def test_perf_role_compute(self):
+        for size in PERF_SIZES:
+            users = self._create_users(size)
+            self.env.invalidate_all()
+            with self._run_scenario('user_role_compute', size, 4):
+                roles = users.mapped('csl_project_role')
+            self.assertEqual(set(roles), {'none'})
+
+    def test_perf_role_inverse(self):
+        for size in PERF_SIZES:
+            users = self._create_users(size)
+            with self._run_scenario('user_role_inverse', size, 40):
+                users.write({'csl_project_role': 'project_manager'})
+            users.invalidate_recordset(['csl_project_role'])
+            self.assertEqual(set(users.mapped('csl_project_role')), {'project_manager'})
+
+            with self._run_scenario('user_role_bulk_set', size, 40):
+                users._set_csl_project_role('purchase_manager')
+            self.assertEqual(set(users.mapped('csl_project_role')), {'purchase_manager'})
+        self.assertQueryCountFlat('user_role_inverse')
+        self.assertQueryCountFlat('user_role_bulk_set')
@@ -0,0 +1,73 @@
+# -*- coding: utf-8 -*-
+import time
+
+from odoo.tests import tagged
+from odoo.tools.sql import SQL
+
+from .common import ProjectCslPerfCase
+
+# Terms planted in a few synthetic projects, with the number of matches
+SEARCH_TERMS = {
+    'crane rental': 10,
+    'PRJ-PERF-0042': 1,
+    'zzz-no-match': 0,
+}
+
+
+@tagged('post_install', '-at_install', '-standard', 'perf')
+class TestPerfProjectSearch(ProjectCslPerfCase):
+    """Free-text project search on 100k synthetic projects."""
+
+    project_count = 100000
+
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.env.flush_all()
+        # Plain SQL: going through the ORM would make the setup the benchmark
+        cls.env.cr.execute("""
+            INSERT INTO project_csl (name, project_reference, customer_id, company_id, state,
+                                     date_start, budget_details, task_duties_details,
+                                     create_uid, write_uid, create_date, write_date)
+            SELECT 'Synthetic Project ' || n,
+                   'PRJ-PERF-' || lpad(n::text, 4, '0'),
+                   %(customer_id)s,
+                   %(company_id)s,
+                   'confirm',
+                   DATE '2024-01-01' + (n %% 365),
+                   CASE WHEN n %% 10000 = 0 THEN 'Includes crane rental for the lifting works' END,
+                   'Task list ' || md5(n::text),
+                   %(uid)s, %(uid)s, NOW() AT TIME ZONE 'UTC', NOW() AT TIME ZONE 'UTC'
+              FROM generate_series(1, %(count)s) AS n
+        """, {
+            'customer_id': cls.customer.id,
+            'company_id': cls.env.company.id,
+            'uid': cls.env.uid,
+            'count': cls.project_count,
+        })
+        cls.env.cr.execute("ANALYZE project_csl")
+        cls.env['project.csl'].invalidate_model()
+
+    def _uses_trigram_index(self, term):
+        self.env.cr.execute(SQL("EXPLAIN (FORMAT JSON) %s", self.env['project.csl']._get_search_match_query(term)))
+        return '_trgm_index' in str(self.env.cr.fetchone()[0])
+
+    def test_perf_search_100k_projects(self):
+        Project = self.env['project.csl']
+        for term, expected in SEARCH_TERMS.items():
+            start = time.perf_counter()
+            ranked = Project.search_ranked(term, limit=80)
+            ranked_seconds = time.perf_counter() - start
+
+            start = time.perf_counter()
+            count = Project.search_count([('search_text', 'ilike', term)])
+            domain_seconds = time.perf_counter() - start
+
+            self.assertEqual(len(ranked), expected, f"search_ranked({term!r})")
+            self.assertEqual(count, expected, f"search_text ilike {term!r}")
+            self._perf_results.setdefault('project_search_100k', {})[term] = {
+                'matches': expected,
+                'search_ranked_seconds': round(ranked_seconds, 4),
+                'search_domain_seconds': round(domain_seconds, 4),
+                'uses_trigram_index': self.env.registry.has_trigram and self._uses_trigram_index(term),
+            }
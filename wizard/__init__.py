@@ -0,0 +1,3 @@
+# -*- coding: utf-8 -*-
+from . import project_csl_attach_wizard
+from . import res_users_csl_role_wizard
@@ -0,0 +1,108 @@
+# -*- coding: utf-8 -*-
+from odoo import models, fields, api
+from odoo.exceptions import UserError
+from odoo.tools import split_every
+from odoo.tools.safe_eval import safe_eval
+
+from ..models.project_lines import _link_orders_to_projects
+
+# Project line model and its order field for each attachable document model
+PROJECT_LINE_BY_ORDER_MODEL = {
+    'sale.order': ('project.quotation.line', 'quotation_id'),
+    'purchase.order': ('project.purchase.line', 'purchase_order_id'),
+}
+
+class ProjectCslAttachWizard(models.TransientModel):
+    _name = 'project.csl.attach.wizard'
+    _description = 'Attach Documents to Project'
+
+    _chunk_size = 1000
+
+    project_id = fields.Many2one('project.csl', string='Project', required=True)
+    document_model = fields.Selection([
+        ('sale.order', 'Quotations / Sales Orders'),
+        ('purchase.order', 'Purchase Orders'),
+    ], string='Documents', required=True, default='purchase.order')
+    domain = fields.Char(string='Filter', default='[]', required=True)
+    run_in_background = fields.Boolean(
+        string='Run in Background',
+        help="Queue the linking as background jobs instead of running it now.")
+
+    document_count = fields.Integer(string='Matching Documents', compute='_compute_preview')
+    preview = fields.Text(string='Totals', compute='_compute_preview')
+
+    def _get_document_domain(self):
+        self.ensure_one()
+        return safe_eval(self.domain or '[]')
+
+    @api.depends('document_model', 'domain')
+    def _compute_preview(self):
+        """Count and sum the matching documents with one aggregate query."""
+        for wizard in self:
+            groups = self.env[wizard.document_model]._read_group(
+                wizard._get_document_domain(),
+                groupby=['currency_id'],
+                aggregates=['__count', 'amount_untaxed:sum', 'amount_total:sum'],
+            )
+            wizard.document_count = sum(count for _currency, count, _untaxed, _total in groups)
+            wizard.preview = "\n".join(
+                f"{currency.name}: {count} document(s), "
+                f"{currency.format(untaxed)} untaxed, {currency.format(total)} total"
+                for currency, count, untaxed, total in groups
+            )
+
+    def action_attach(self):
+        self.ensure_one()
+        orders = self.env[self.document_model].search(self._get_document_domain(), order='id')
+        if not orders:
+            raise UserError("No document matches the filter.")
+
+        if self.run_in_background:
+            self.env['project.csl.job']._enqueue(
+                orders, '_job_attach_to_project_csl',
+                name=f"Attach documents to {self.project_id.display_name}",
+                chunk_size=self._chunk_size,
+                project=self.project_id,
+                kwargs={'project_id': self.project_id.id},
+            )
+        else:
+            for chunk_ids in split_every(self._chunk_size, orders.ids, list):
+                self._attach_orders(self.document_model, chunk_ids, self.project_id.id)
+                # Keep memory flat on large selections
+                self.env.invalidate_all()
+        return {'type': 'ir.actions.act_window_close'}
+
+    @api.model
+    def _attach_orders(self, order_model, order_ids, project_id):
+        """Link a chunk of orders, their project lines and invoices to a project.
+
+        An order keeps a single project line: a line it has on another
+        project is moved to this one with one grouped write, any further
+        lines are removed, and missing lines are created in one call. The
+        write and create hooks link the orders and invoices. Orders that
+        already had a line on the project are (re)linked with one grouped
+        write.
+        """
+        line_model, order_field = PROJECT_LINE_BY_ORDER_MODEL[order_model]
+        Line = self.env[line_model].with_context(project_csl_no_tracking=True)
+        lines = Line.search_fetch([(order_field, 'in', order_ids)], ['project_id', order_field], order='id')
+
+        existing_lines = lines.filtered(lambda line: line.project_id.id == project_id)
+        linked_order_ids = set(existing_lines[order_field].ids)
+        lines_to_move = Line.browse()
+        lines_to_unlink = Line.browse()
+        for line in lines - existing_lines:
+            if line[order_field].id in linked_order_ids:
+                lines_to_unlink |= line
+            else:
+                lines_to_move |= line
+                linked_order_ids.add(line[order_field].id)
+
+        lines_to_unlink.unlink()
+        lines_to_move.write({'project_id': project_id})
+        Line.create([
+            {'project_id': project_id, order_field: order_id}
+            for order_id in order_ids
+            if order_id not in linked_order_ids
+        ])
+        _link_orders_to_projects(existing_lines, order_field)
@@ -0,0 +1,24 @@
+# -*- coding: utf-8 -*-
+from odoo import models, fields
+
+class ResUsersCslRoleWizard(models.TransientModel):
+    _name = 'res.users.csl.role.wizard'
+    _description = 'Assign Project (CSL) Role'
+
+    user_ids = fields.Many2many(
+        'res.users',
+        string='Users',
+        required=True,
+        default=lambda self: self.env.context.get('active_ids', []) if self.env.context.get('active_model') == 'res.users' else [],
+    )
+    csl_project_role = fields.Selection(
+        selection=lambda self: self.env['res.users']._fields['csl_project_role'].selection,
+        string='Project (CSL) Role',
+        required=True,
+        default='none',
+    )
+
+    def action_assign_role(self):
+        self.ensure_one()
+        self.user_ids._set_csl_project_role(self.csl_project_role)
+        return {'type': 'ir.actions.act_window_close'}